@@ -0,0 +1,23 @@
+"""
+pyvest : analyse d'actifs financiers (séries de prix, univers, risque).
+
+Les classes principales sont exposées ici mais importées à la demande
+(PEP 562) : `import pyvest.src` ne charge ni pandas, ni scipy, ni yfinance.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "PriceSeries": "priceseries",
+    "Asset": "asset",
+    "Universe": "universe",
+    "DataLoader": "loader",
+    "CurrencyEnum": "constant",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,9 @@
+import numpy as np
+
+from .constant import CurrencyEnum
+from .priceseries import PriceSeries
+from .resample import CURRENCY_CALENDARS, NYSE, TradingCalendar
+
 
 class Asset:
     """
@@ -16,6 +22,7 @@ class Asset:
         prices: Instance PriceSeries contenant l'historique (COMPOSÉE)
         sector: Classification sectorielle
         currency: Devise des prix (défaut: USD)
+        calendar: Calendrier de cotation (défaut: celui de la devise)
     """
    
     def __init__(
@@ -23,7 +30,8 @@ class Asset:
         ticker: str,
         prices: PriceSeries,
         sector: str | None = None,
-        currency: CurrencyEnum = CurrencyEnum.USD
+        currency: CurrencyEnum = CurrencyEnum.USD,
+        calendar: TradingCalendar | None = None
     ) -> None:
         """
         Initialise un Asset.
@@ -33,6 +41,8 @@ class Asset:
             prices: Série de prix (ne peut pas être vide)
             sector: Secteur d'activité (optionnel)
             currency: Devise (défaut: USD)
+            calendar: Calendrier de cotation (ex: CRYPTO pour BTC-USD) ;
+                par défaut celui de la devise, NYSE si elle n'en a pas
        
         Raises:
             ValueError: Si ticker est vide ou prices est vide
@@ -47,6 +57,7 @@ class Asset:
         self.prices = prices  # Composition : Asset POSSÈDE une PriceSeries
         self.sector = sector
         self.currency = currency
+        self.calendar = calendar if calendar is not None else CURRENCY_CALENDARS.get(currency, NYSE)
    
     def __repr__(self) -> str:
         """Représentation pour le développement."""
@@ -81,11 +92,6 @@ class Asset:
         """Drawdown maximum (délègue à PriceSeries)."""
         return self.prices.max_drawdown()
     
-    import numpy as np
-
-class Asset:
-    # ... (code précédent) ...
-    
     def correlation_with(self, other: "Asset") -> float:
         """
         Calcule la corrélation de Pearson des log-rendements avec un autre actif.
@@ -129,4 +135,4 @@ class Asset:
                 "La corrélation n'est pas définie pour une série constante."
             )
         
-        return covariance / np.sqrt(var_x * var_y)
\ No newline at end of file
+        return covariance / np.sqrt(var_x * var_y)
@@ -0,0 +1,94 @@
+"""
+Point d'entrée en ligne de commande `pyvest`.
+
+Exemple :
+    pyvest AAPL MSFT --start 2024-01-01 --end 2024-12-01 -o report.csv
+
+Les dépendances lourdes (pandas, yfinance) ne sont importées par DataLoader
+qu'en cas de défaut de cache : un run servi entièrement par le cache
+démarre rapidement.
+"""
+from pathlib import Path
+from typing import Sequence, TextIO
+import argparse
+import csv
+import logging
+import sys
+
+from .metrics import METRIC_NAMES
+
+REPORT_COLUMNS = ["ticker", *METRIC_NAMES]
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pyvest",
+        description="Récupère une liste de tickers, calcule leurs métriques et écrit un rapport CSV.",
+    )
+    parser.add_argument("tickers", nargs="*", help="Tickers à traiter (ex: AAPL MSFT)")
+    parser.add_argument("--tickers-file", type=Path, help="Fichier avec un ticker par ligne")
+    parser.add_argument("--start", required=True, help="Date de début (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Date de fin (YYYY-MM-DD)")
+    parser.add_argument("--price-col", default="Close", help="Colonne de prix (défaut: Close)")
+    parser.add_argument("--cache-dir", default=".cache", help="Répertoire du cache (défaut: .cache)")
+    parser.add_argument("--risk-free-rate", type=float, default=0.0, help="Taux sans risque annuel")
+    parser.add_argument("-o", "--output", type=Path, help="Fichier CSV de sortie (défaut: stdout)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Logs détaillés")
+
+    args = parser.parse_args(argv)
+    if args.tickers_file is not None:
+        lines = args.tickers_file.read_text().splitlines()
+        args.tickers += [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    if not args.tickers:
+        parser.error("aucun ticker fourni")
+    return args
+
+
+def write_report(rows: list[dict[str, object]], out: TextIO) -> None:
+    """Écrit le rapport au format CSV."""
+    writer = csv.DictWriter(out, fieldnames=REPORT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Exécute le batch : fetch, calcul des métriques, écriture du rapport.
+
+    Returns:
+        Code de sortie (0 si tous les tickers ont été traités, 1 sinon)
+    """
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+    logger = logging.getLogger("pyvest")
+
+    from .loader import DataLoader
+
+    loader = DataLoader(cache_dir=args.cache_dir)
+    tickers = [t.upper() for t in args.tickers]
+    # Métriques relues depuis le cache tant que les prix n'ont pas changé
+    metrics = loader.fetch_metrics(
+        tickers, args.price_col, (args.start, args.end), args.risk_free_rate
+    )
+
+    rows = []
+    for ticker in tickers:
+        if ticker not in metrics:
+            logger.warning(f"{ticker}: ignoré (pas de données ou série trop courte)")
+            continue
+        rows.append({"ticker": ticker, **metrics[ticker]})
+
+    if args.output is None:
+        write_report(rows, sys.stdout)
+    else:
+        with open(args.output, "w", newline="") as f:
+            write_report(rows, f)
+
+    return 0 if len(rows) == len(tickers) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, leaves_list, linkage
+
+from .returns import log_returns_panel
+
+
+def correlation_to_distance(corr_matrix: pd.DataFrame | np.ndarray) -> np.ndarray:
+    """
+    Convertit une matrice de corrélation en distances au format condensé.
+
+    Distance de corrélation : d = √(½·(1 - ρ)), comprise entre 0 et 1.
+    Le format condensé est le triangle supérieur (k=1) lu ligne par ligne,
+    soit le même ordre que `extract_upper_triangle` et celui attendu
+    par scipy.
+
+    Args:
+        corr_matrix: Matrice de corrélation carrée
+
+    Returns:
+        Vecteur de taille N(N-1)/2
+    """
+    corr = np.asarray(corr_matrix, dtype=float)
+    rows, cols = np.triu_indices(corr.shape[0], k=1)
+    return np.sqrt(0.5 * (1.0 - np.clip(corr[rows, cols], -1.0, 1.0)))
+
+
+def condensed_distance(
+    assets: Iterable,
+    block_size: int = 512
+) -> tuple[list[str], np.ndarray]:
+    """
+    Distances de corrélation calculées directement au format condensé.
+
+    Les rendements sont standardisés une fois, puis les corrélations sont
+    calculées par blocs de lignes : seul un bloc (block_size, N) est en
+    mémoire en plus du vecteur condensé, jamais la matrice N×N.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+        block_size: Nombre de lignes calculées à la fois
+
+    Returns:
+        tuple: (tickers, distances)
+
+    Raises:
+        ValueError: Si un actif a une variance nulle
+    """
+    tickers, returns = log_returns_panel(assets)
+    t, n = returns.shape
+
+    x = returns - returns.mean(axis=0)
+    norms = np.sqrt(np.einsum("ij,ij->j", x, x))
+    if np.any(norms == 0):
+        raise ValueError(
+            "Variance nulle détectée. "
+            "La corrélation n'est pas définie pour une série constante."
+        )
+    z = x / norms
+
+    distances = np.empty(n * (n - 1) // 2)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = z[:, start:stop].T @ z[:, start:]
+        for i in range(start, stop):
+            # Début de la ligne i dans le vecteur condensé
+            offset = i * n - i * (i + 1) // 2
+            row = block[i - start, i - start + 1:]
+            distances[offset:offset + len(row)] = row
+
+    np.clip(distances, -1.0, 1.0, out=distances)
+    np.sqrt(0.5 * (1.0 - distances), out=distances)
+    return tickers, distances
+
+
+def hierarchical_clusters(
+    assets: Iterable,
+    n_clusters: int | None = None,
+    threshold: float | None = None,
+    method: str = "average"
+) -> tuple[pd.Series, np.ndarray]:
+    """
+    Classification hiérarchique des actifs à partir de leurs corrélations.
+
+    Exactement un des deux critères de coupe doit être fourni.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+        n_clusters: Nombre de groupes souhaité
+        threshold: Distance de corrélation maximale à l'intérieur d'un groupe
+        method: Méthode de linkage scipy ('single', 'complete', 'average', 'ward'...)
+
+    Returns:
+        tuple: (labels, linkage_matrix)
+        - labels: Series {ticker: numéro de groupe (à partir de 1)}
+        - linkage_matrix: Matrice de linkage scipy, réutilisable par `hrp_order`
+
+    Raises:
+        ValueError: Si aucun ou les deux critères de coupe sont fournis
+    """
+    if (n_clusters is None) == (threshold is None):
+        raise ValueError("Fournir exactement un critère: n_clusters ou threshold")
+
+    tickers, distances = condensed_distance(assets)
+    link = linkage(distances, method=method)
+
+    if n_clusters is not None:
+        labels = fcluster(link, t=n_clusters, criterion="maxclust")
+    else:
+        labels = fcluster(link, t=threshold, criterion="distance")
+
+    return pd.Series(labels, index=tickers, name="cluster"), link
+
+
+def hrp_order(tickers: list[str], linkage_matrix: np.ndarray) -> list[str]:
+    """
+    Ordre de quasi-diagonalisation (Hierarchical Risk Parity).
+
+    Trier les actifs selon les feuilles du dendrogramme place les actifs
+    corrélés côte à côte : la matrice de covariance réordonnée devient
+    quasi-diagonale par blocs.
+
+    Args:
+        tickers: Tickers dans l'ordre utilisé pour construire le linkage
+        linkage_matrix: Matrice renvoyée par `hierarchical_clusters`
+
+    Returns:
+        Tickers réordonnés
+    """
+    return [tickers[i] for i in leaves_list(linkage_matrix)]
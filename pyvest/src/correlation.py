@@ -0,0 +1,302 @@
+from collections import deque
+from pathlib import Path
+from typing import Iterable
+import json
+
+import numpy as np
+import pandas as pd
+
+from .returns import log_returns_panel
+
+
+class CorrelationAccumulator:
+    """
+    Matrice de corrélation mise à jour incrémentalement.
+
+    Conserve le poids total, la somme des rendements et la matrice des
+    produits croisés (dont la diagonale contient les sommes des carrés).
+    Ajouter une journée de rendements est une mise à jour de rang 1 en
+    O(N²), au lieu de recalculer la matrice sur tout l'historique en O(N²·T).
+
+    Trois modes :
+    - cumulatif (par défaut) : tout l'historique avec le même poids
+    - decay : pondération exponentielle, poids λ^k pour l'observation d'il y a k jours
+    - window : fenêtre glissante des `window` dernières observations
+
+    Attributes:
+        tickers: Tickers dans l'ordre des lignes/colonnes
+        decay: Facteur λ entre 0 et 1 (optionnel)
+        window: Taille de la fenêtre glissante (optionnelle)
+    """
+
+    def __init__(
+        self,
+        tickers: list[str],
+        decay: float | None = None,
+        window: int | None = None
+    ) -> None:
+        if decay is not None and window is not None:
+            raise ValueError("decay et window sont mutuellement exclusifs")
+        if decay is not None and not 0 < decay < 1:
+            raise ValueError("decay doit être strictement compris entre 0 et 1")
+        if window is not None and window < 2:
+            raise ValueError("window doit être supérieur ou égal à 2")
+
+        n = len(tickers)
+        self.tickers = list(tickers)
+        self.decay = decay
+        self.window = window
+        self._weight = 0.0
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+        self._history: deque[np.ndarray] = deque()
+
+    def __repr__(self) -> str:
+        return f"CorrelationAccumulator({len(self.tickers)} assets, weight={self._weight:g})"
+
+    @classmethod
+    def from_assets(
+        cls,
+        assets: Iterable,
+        decay: float | None = None,
+        window: int | None = None
+    ) -> "CorrelationAccumulator":
+        """Initialise l'accumulateur avec l'historique des log-rendements."""
+        tickers, returns = log_returns_panel(assets)
+        acc = cls(tickers, decay=decay, window=window)
+        acc.update_many(returns)
+        return acc
+
+    def update(self, returns: np.ndarray) -> None:
+        """
+        Ajoute une observation (un rendement par actif) en O(N²).
+
+        Args:
+            returns: Vecteur (N,) dans l'ordre de `tickers`
+        """
+        x = np.asarray(returns, dtype=float)
+        if x.shape != (len(self.tickers),):
+            raise ValueError(f"returns doit être de forme ({len(self.tickers)},)")
+
+        if self.decay is not None:
+            self._weight *= self.decay
+            self._sum *= self.decay
+            self._cross *= self.decay
+
+        self._weight += 1.0
+        self._sum += x
+        self._cross += np.outer(x, x)
+
+        if self.window is not None:
+            self._history.append(x)
+            if len(self._history) > self.window:
+                # Retrait de l'observation la plus ancienne (rang 1)
+                old = self._history.popleft()
+                self._weight -= 1.0
+                self._sum -= old
+                self._cross -= np.outer(old, old)
+
+    def update_many(self, returns: np.ndarray) -> None:
+        """
+        Ajoute plusieurs observations d'un coup.
+
+        Args:
+            returns: Matrice (T, N), lignes dans l'ordre chronologique
+        """
+        x = np.asarray(returns, dtype=float)
+        if x.ndim != 2 or x.shape[1] != len(self.tickers):
+            raise ValueError(f"returns doit être de forme (T, {len(self.tickers)})")
+
+        if self.window is not None:
+            # Seules les `window` dernières lignes restent dans la fenêtre
+            for row in x[-self.window:]:
+                self.update(row)
+            return
+
+        weights = np.ones(len(x))
+        if self.decay is not None:
+            weights = self.decay ** np.arange(len(x) - 1, -1, -1)
+            factor = self.decay ** len(x)
+            self._weight *= factor
+            self._sum *= factor
+            self._cross *= factor
+
+        self._weight += weights.sum()
+        self._sum += weights @ x
+        self._cross += (x * weights[:, None]).T @ x
+
+    def covariance(self) -> np.ndarray:
+        """Covariance pondérée, normalisée par le poids total."""
+        if self._weight <= 1.0:
+            raise ValueError("Pas assez d'observations pour estimer une covariance")
+        mean = self._sum / self._weight
+        return self._cross / self._weight - np.outer(mean, mean)
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        """
+        Matrice de corrélation courante.
+
+        Returns:
+            DataFrame symétrique avec tickers en index et colonnes
+            (NaN pour les actifs de variance nulle)
+        """
+        cov = self.covariance()
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+
+class MemmapCorrelation:
+    """
+    Matrice de corrélation N×N stockée sur disque (numpy.memmap).
+
+    Pour les très grands univers, la matrice ne tient pas en mémoire sous
+    forme de DataFrame. Elle est écrite tuile par tuile dans un fichier
+    binaire (ligne par ligne, C-order) accompagné d'un fichier JSON de
+    métadonnées ; les requêtes ne lisent que les lignes nécessaires.
+
+    Attributes:
+        path: Chemin du fichier binaire
+        tickers: Tickers dans l'ordre des lignes/colonnes
+        matrix: memmap (N, N) en lecture seule
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self._meta_path(self.path)) as f:
+            meta = json.load(f)
+        self.tickers: list[str] = meta["tickers"]
+        self.matrix = np.memmap(
+            self.path, dtype=meta["dtype"], mode="r",
+            shape=(len(self.tickers), len(self.tickers))
+        )
+        self._ticker_to_idx = {t: i for i, t in enumerate(self.tickers)}
+
+    def __repr__(self) -> str:
+        return f"MemmapCorrelation({str(self.path)!r}, {len(self)} assets)"
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @staticmethod
+    def _meta_path(path: Path) -> Path:
+        return path.with_name(path.name + ".json")
+
+    @classmethod
+    def build(
+        cls,
+        assets: Iterable,
+        path: str | Path,
+        dtype: str = "float32",
+        block_size: int = 1024
+    ) -> "MemmapCorrelation":
+        """
+        Calcule la matrice par tuiles et l'écrit sur disque.
+
+        Les rendements sont standardisés une seule fois ; chaque tuile
+        (i, j) avec j >= i est un produit matriciel (block, T) @ (T, block)
+        écrit en (i, j) et en (j, i). Seule une tuile est en mémoire à la fois.
+
+        Args:
+            assets: Itérable d'Asset (une Universe convient)
+            path: Chemin du fichier binaire à créer
+            dtype: 'float32' (moitié moins de disque) ou 'float64'
+            block_size: Taille des tuiles
+
+        Returns:
+            MemmapCorrelation ouverte en lecture
+        """
+        if np.dtype(dtype) not in (np.float32, np.float64):
+            raise ValueError("dtype doit être 'float32' ou 'float64'")
+
+        path = Path(path)
+        tickers, returns = log_returns_panel(assets)
+        n = len(tickers)
+
+        x = returns - returns.mean(axis=0)
+        norms = np.sqrt(np.einsum("ij,ij->j", x, x))
+        # Colonne NaN pour les séries constantes (corrélation non définie)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (x / norms).astype(dtype)
+
+        out = np.memmap(path, dtype=dtype, mode="w+", shape=(n, n))
+        for i0 in range(0, n, block_size):
+            i1 = min(i0 + block_size, n)
+            for j0 in range(i0, n, block_size):
+                j1 = min(j0 + block_size, n)
+                tile = np.clip(z[:, i0:i1].T @ z[:, j0:j1], -1.0, 1.0)
+                out[i0:i1, j0:j1] = tile
+                if j0 != i0:
+                    out[j0:j1, i0:i1] = tile.T
+        idx = np.arange(n)
+        out[idx, idx] = 1.0
+        out.flush()
+        del out
+
+        with open(cls._meta_path(path), "w") as f:
+            json.dump({"tickers": tickers, "dtype": np.dtype(dtype).name}, f)
+        return cls(path)
+
+    def _index(self, ticker: str) -> int:
+        try:
+            return self._ticker_to_idx[ticker.upper()]
+        except KeyError:
+            raise KeyError(f"Ticker inconnu: {ticker}") from None
+
+    def get(self, ticker_1: str, ticker_2: str) -> float:
+        """Corrélation entre deux actifs."""
+        return float(self.matrix[self._index(ticker_1), self._index(ticker_2)])
+
+    def row(self, ticker: str) -> pd.Series:
+        """Corrélations d'un actif avec tous les autres (lit une seule ligne)."""
+        i = self._index(ticker)
+        return pd.Series(np.array(self.matrix[i]), index=self.tickers, name=self.tickers[i])
+
+    def upper_triangle(
+        self,
+        min_correlation: float | None = None,
+        use_absolute: bool = False,
+        block_size: int = 1024
+    ) -> pd.DataFrame:
+        """
+        Paires uniques du triangle supérieur, comme `extract_upper_triangle`.
+
+        Seules les colonnes j > i de chaque bloc de lignes sont lues.
+        Sur un grand univers, `min_correlation` évite de matérialiser
+        les N(N-1)/2 paires.
+
+        Args:
+            min_correlation: Seuil minimal (sur |corrélation| si use_absolute)
+            use_absolute: Si True, filtre et trie par |corrélation|
+            block_size: Nombre de lignes lues à la fois
+
+        Returns:
+            DataFrame avec colonnes ['asset_1', 'asset_2', 'correlation']
+            trié par corrélation décroissante
+        """
+        n = len(self)
+        rows, cols, values = [], [], []
+        for i0 in range(0, n, block_size):
+            i1 = min(i0 + block_size, n)
+            block = np.array(self.matrix[i0:i1, i0:])
+            mask = np.triu(np.ones(block.shape, dtype=bool), k=1)
+            if min_correlation is not None:
+                key = np.abs(block) if use_absolute else block
+                mask &= key >= min_correlation
+            r, c = np.nonzero(mask)
+            rows.append(r + i0)
+            cols.append(c + i0)
+            values.append(block[r, c])
+
+        rows, cols, values = (np.concatenate(a) for a in (rows, cols, values))
+        key = np.abs(values) if use_absolute else values
+        order = np.argsort(-key, kind="stable")
+        tickers = np.array(self.tickers, dtype=object)
+        return pd.DataFrame({
+            "asset_1": tickers[rows[order]],
+            "asset_2": tickers[cols[order]],
+            "correlation": values[order],
+        })
@@ -0,0 +1,193 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .returns import log_returns_panel
+
+
+class FactorCovariance:
+    """
+    Matrice de covariance stockée sous forme factorisée.
+
+        Σ = B Bᵀ + diag(d)
+
+    Pour N actifs et k facteurs, le stockage est en O(N·k) au lieu de O(N²).
+    Les variances de portefeuille et les corrélations se calculent sans
+    jamais former la matrice N×N complète.
+
+    Attributes:
+        tickers: Tickers dans l'ordre des lignes de `loadings`
+        loadings: Matrice B (N, k) des expositions aux facteurs
+        specific: Vecteur d (N,) des variances spécifiques
+    """
+
+    def __init__(
+        self,
+        tickers: list[str],
+        loadings: np.ndarray,
+        specific: np.ndarray
+    ) -> None:
+        loadings = np.asarray(loadings, dtype=float)
+        specific = np.asarray(specific, dtype=float)
+        if loadings.ndim != 2 or loadings.shape[0] != len(tickers):
+            raise ValueError("loadings doit être de forme (N, k)")
+        if specific.shape != (len(tickers),):
+            raise ValueError("specific doit être de forme (N,)")
+
+        self.tickers = list(tickers)
+        self.loadings = loadings
+        self.specific = specific
+        self._ticker_to_idx = {t: i for i, t in enumerate(self.tickers)}
+
+    def __repr__(self) -> str:
+        return f"FactorCovariance({len(self)} assets, {self.n_factors} factors)"
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def n_factors(self) -> int:
+        return self.loadings.shape[1]
+
+    @property
+    def variances(self) -> np.ndarray:
+        """Diagonale de Σ (variances par période)."""
+        return np.einsum("ik,ik->i", self.loadings, self.loadings) + self.specific
+
+    def _index(self, ticker: str) -> int:
+        try:
+            return self._ticker_to_idx[ticker.upper()]
+        except KeyError:
+            raise KeyError(f"Ticker inconnu: {ticker}") from None
+
+    def portfolio_variance(self, weights: np.ndarray) -> float:
+        """
+        Variance d'un portefeuille en O(N·k).
+
+        Formule: wᵀΣw = ||Bᵀw||² + Σ d_i w_i²
+
+        Args:
+            weights: Poids (N,) dans l'ordre de `tickers`
+        """
+        w = np.asarray(weights, dtype=float)
+        if w.shape != (len(self),):
+            raise ValueError(f"weights doit être de forme ({len(self)},)")
+        exposure = self.loadings.T @ w
+        return float(exposure @ exposure + self.specific @ (w * w))
+
+    def covariance(self, ticker_1: str, ticker_2: str) -> float:
+        """Covariance entre deux actifs."""
+        i, j = self._index(ticker_1), self._index(ticker_2)
+        cov = self.loadings[i] @ self.loadings[j]
+        if i == j:
+            cov += self.specific[i]
+        return float(cov)
+
+    def correlation(self, ticker_1: str, ticker_2: str) -> float:
+        """Corrélation entre deux actifs en O(k)."""
+        cov = self.covariance(ticker_1, ticker_2)
+        return cov / np.sqrt(
+            self.covariance(ticker_1, ticker_1) * self.covariance(ticker_2, ticker_2)
+        )
+
+    def correlation_row(self, ticker: str) -> pd.Series:
+        """
+        Corrélations d'un actif avec tous les autres en O(N·k).
+
+        Returns:
+            Series indexée par ticker
+        """
+        i = self._index(ticker)
+        var = self.variances
+        row = (self.loadings @ self.loadings[i]) / np.sqrt(var * var[i])
+        row[i] = 1.0
+        return pd.Series(row, index=self.tickers, name=self.tickers[i])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Forme explicitement la matrice N×N.
+
+        À réserver aux petits univers : c'est précisément ce que
+        la forme factorisée permet d'éviter.
+        """
+        matrix = self.loadings @ self.loadings.T
+        matrix[np.diag_indices_from(matrix)] += self.specific
+        return pd.DataFrame(matrix, index=self.tickers, columns=self.tickers)
+
+
+def ledoit_wolf(assets: Iterable) -> tuple[FactorCovariance, float]:
+    """
+    Estimateur de Ledoit-Wolf (2004) avec cible identité pondérée.
+
+        Σ = δ·μ·I + (1 - δ)·S,  avec S = XᵀX / T et μ = tr(S) / N
+
+    L'intensité de shrinkage δ est calculée à partir de la matrice de
+    Gram la plus petite (XXᵀ si N > T, XᵀX sinon), donc sans former S
+    quand N est grand. Le résultat est factorisé avec B = √((1-δ)/T)·Xᵀ,
+    soit un rang T au plus.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+
+    Returns:
+        tuple: (covariance, shrinkage)
+        - covariance: FactorCovariance des log-rendements (par période)
+        - shrinkage: Intensité δ entre 0 et 1
+    """
+    tickers, returns = log_returns_panel(assets)
+    t, n = returns.shape
+    x = returns - returns.mean(axis=0)
+
+    gram = x @ x.T if n > t else x.T @ x
+    sq_norms = np.einsum("ij,ij->i", x, x)
+
+    mu = sq_norms.sum() / (t * n)
+    s_norm2 = np.sum(gram * gram) / t**2
+    # ||S - μI||² = ||S||² - N·μ²
+    d2 = (s_norm2 - n * mu**2) / n
+    # Σ_t ||x_t x_tᵀ - S||² = Σ_t ||x_t||⁴ - T·||S||²
+    b2_bar = (np.sum(sq_norms**2) - t * s_norm2) / (t**2 * n)
+    b2 = min(b2_bar, d2)
+    shrinkage = float(b2 / d2) if d2 > 0 else 1.0
+
+    loadings = np.sqrt((1.0 - shrinkage) / t) * x.T
+    specific = np.full(n, shrinkage * mu)
+    return FactorCovariance(tickers, loadings, specific), shrinkage
+
+
+def pca_factor_model(assets: Iterable, n_factors: int = 5) -> FactorCovariance:
+    """
+    Modèle à facteurs statistiques (ACP) sur les log-rendements.
+
+    Les k premières composantes principales de la SVD des rendements
+    centrés forment les facteurs ; la variance non expliquée de chaque
+    actif devient sa variance spécifique. La SVD tronquée coûte
+    O(T·N·min(T, N)) et la matrice N×N n'est jamais formée.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+        n_factors: Nombre de facteurs k
+
+    Returns:
+        FactorCovariance de rang k (covariance par période, ddof=1)
+
+    Raises:
+        ValueError: Si n_factors n'est pas compris entre 1 et min(T-1, N)
+    """
+    tickers, returns = log_returns_panel(assets)
+    t, n = returns.shape
+    if not 1 <= n_factors <= min(t - 1, n):
+        raise ValueError(
+            f"n_factors doit être compris entre 1 et {min(t - 1, n)}"
+        )
+
+    x = returns - returns.mean(axis=0)
+    _, s, vt = np.linalg.svd(x, full_matrices=False)
+
+    loadings = vt[:n_factors].T * (s[:n_factors] / np.sqrt(t - 1))
+    total_var = np.einsum("ij,ij->j", x, x) / (t - 1)
+    explained = np.einsum("ik,ik->i", loadings, loadings)
+    # Plancher pour garder Σ définie positive malgré les erreurs d'arrondi
+    specific = np.maximum(total_var - explained, 1e-12 * total_var.max())
+    return FactorCovariance(tickers, loadings, specific)
@@ -1,12 +1,24 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
 from pathlib import Path
 import logging
+import os
 import pickle
-from datetime import datetime
-from typing import Sequence
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-import pandas as pd
-import yfinance as yf
+if TYPE_CHECKING:
+    import pandas as pd
 
+from .metrics import compute_metrics, metrics_key
 from .priceseries import PriceSeries
 
 class DataLoader:
@@ -19,6 +31,12 @@ class DataLoader:
     3. OVERLAP_AFTER : Intersection partielle, fetch complémentaire à droite
     4. OVERLAP_BEFORE : Intersection partielle, fetch complémentaire à gauche
     5. MISS : Aucune donnée en cache, fetch complet nécessaire
+
+    Le cache peut être partagé entre plusieurs processus :
+    - les fichiers sont écrits dans un fichier temporaire puis renommés
+      (os.replace est atomique), un lecteur ne voit jamais un fichier partiel
+    - les fetchs d'un même couple (ticker, price_col) sont sérialisés par un
+      verrou fichier : un seul processus télécharge, les autres relisent le cache
     
     Attributes:
         cache_dir: Répertoire de stockage du cache
@@ -44,6 +62,101 @@ class DataLoader:
         """
         return self.cache_dir / f"{ticker}_{price_col}_{dates[0]}_{dates[1]}.pkl"
 
+    def _get_metrics_path(self, ticker: str, price_col: str) -> Path:
+        """
+        Chemin du fichier de métriques matérialisées d'un couple (ticker, price_col).
+
+        Format: {ticker}_{price_col}.metrics (ignoré par `_load_from_cache`)
+        """
+        return self.cache_dir / f"{ticker}_{price_col}.metrics"
+
+    @contextmanager
+    def _cache_lock(self, ticker: str, price_col: str) -> Iterator[None]:
+        """
+        Verrou exclusif inter-processus sur un couple (ticker, price_col).
+
+        Format: {ticker}_{price_col}.lock. `clear_cache` peut supprimer un
+        verrou libre (POSIX) : après l'avoir obtenu, on vérifie que le fichier
+        verrouillé est toujours celui du répertoire, sinon on recommence sur
+        le nouveau fichier pour ne pas casser l'exclusion mutuelle.
+        """
+        lock_path = self.cache_dir / f"{ticker}_{price_col}.lock"
+        while True:
+            f = open(lock_path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                if not self._is_current_lock(f, lock_path):
+                    # Verrou supprimé par clear_cache pendant l'attente
+                    f.close()
+                    continue
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK abandonne après 10 s : on réessaie
+                        continue
+            break
+
+        with f:
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def _is_current_lock(f, lock_path: Path) -> bool:
+        """Vrai si le fichier ouvert `f` est toujours celui présent à `lock_path`."""
+        try:
+            on_disk = os.stat(lock_path)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(f.fileno())
+        return (on_disk.st_dev, on_disk.st_ino) == (opened.st_dev, opened.st_ino)
+
+    def _remove_free_lock(self, lock_path: Path) -> bool:
+        """
+        Supprime un fichier verrou qu'aucun processus ne détient.
+
+        Returns:
+            True si le fichier a été supprimé. Toujours False sous Windows,
+            où un fichier ouvert ne peut pas être supprimé : les verrous y restent.
+        """
+        if fcntl is None:
+            return False
+        with open(lock_path, 'a+b') as f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Détenu ou attendu par un autre processus
+                return False
+            if not self._is_current_lock(f, lock_path):
+                return False
+            # Supprimé en tenant le verrou : les processus en attente sur ce
+            # fichier le verront remplacé (_is_current_lock) et recommenceront
+            lock_path.unlink()
+            return True
+
+    def _atomic_dump(self, path: Path, data: object) -> None:
+        """Écrit un pickle dans un fichier temporaire puis le renomme en `path`."""
+        # Suffixe .tmp : ignoré par _load_from_cache tant que le renommage n'a pas eu lieu
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
     def _check_date_overlap(
         self,
         cached_start: pd.Timestamp,
@@ -74,14 +187,14 @@ class DataLoader:
 
         # Cas OVERLAP_AFTER: cache hit mais la requête débordre à droite
         if cached_start <= req_start and cached_end < req_end:
-            gap_start = cached_end + pd.Timedelta(days=1)
+            gap_start = cached_end + timedelta(days=1)
             gap_end = req_end
             return ("overlap_after", gap_start, gap_end)
 
         # Cas OVERLAP_BEFORE: cache hit mais la requête déborde à gauche
         if cached_start > req_start and cached_end >= req_end:
             gap_start = req_start
-            gap_end = cached_start - pd.Timedelta(days=1)
+            gap_end = cached_start - timedelta(days=1)
             return ("overlap_before", gap_start, gap_end)
         
         return ("miss", None, None)
@@ -111,6 +224,8 @@ class DataLoader:
             - status: Type de correspondance
             - gap_range: (gap_start, gap_end) si overlap, sinon None
         """
+        import pandas as pd
+
         if not self.cache_dir.exists():
             return (None, "miss", None)
 
@@ -173,7 +288,11 @@ class DataLoader:
                     elif status.startswith("overlap"):
                         return (df, status, (gap_start, gap_end))
 
-            except (ValueError, KeyError, pickle.UnpicklingError) as e:
+            except FileNotFoundError:
+                # Fichier remplacé par un autre processus entre le listage et la lecture
+                continue
+
+            except (ValueError, KeyError, EOFError, pickle.UnpicklingError) as e:
                 # Ignorer les fichiers cache corrompus
                 self.logger.warning(f"Fichier cache corrompu {file_path}: {e}")
                 continue
@@ -186,11 +305,13 @@ class DataLoader:
         prices: list[float],
         dates: list,
         ticker: str, 
+        price_col: str,
         start: str, 
         end: str
     ) -> None:
         """
         Sauvegarde les prix dans un fichier cache avec metadata
+        et invalide les métriques stockées pour (ticker, price_col)
         """
         data = {
             "ticker": ticker,
@@ -201,10 +322,112 @@ class DataLoader:
             "prices": prices,
             "dates": dates
         }
-        with open(cache_path, 'wb') as f:
-            pickle.dump(data, f)
+        self._atomic_dump(cache_path, data)
         self.logger.debug(f"Cache sauvegardé: {cache_path}")
+
+        # Les métriques calculées sur l'ancienne entrée ne sont plus valides
+        self._get_metrics_path(ticker, price_col).unlink(missing_ok=True)
     
+    def _download(
+        self,
+        ticker: str,
+        price_col: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp
+    ) -> pd.DataFrame | None:
+        """
+        Télécharge une colonne de prix depuis Yahoo Finance.
+
+        Returns:
+            DataFrame à une colonne indexé par date, vide si Yahoo n'a
+            aucune ligne sur la période, ou None si le téléchargement a échoué
+        """
+        # Import local : yfinance est long à importer et inutile
+        # quand toutes les données sont servies par le cache
+        import pandas as pd
+        import yfinance as yf
+
+        try:
+            # La borne `end` de yfinance est exclusive
+            raw = yf.download(
+                ticker,
+                start=start.strftime("%Y-%m-%d"),
+                end=(end + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+                progress=False,
+                auto_adjust=False,
+            )
+        except Exception as e:
+            self.logger.error(f"Échec du téléchargement de {ticker}: {e}")
+            return None
+
+        if raw is None or raw.empty or price_col not in raw:
+            return self._empty_frame(price_col)
+
+        # Les versions récentes de yfinance renvoient des colonnes MultiIndex
+        prices = raw[price_col]
+        if isinstance(prices, pd.DataFrame):
+            prices = prices.iloc[:, 0]
+        df = prices.dropna().to_frame(price_col)
+        df.index = pd.to_datetime(df.index).tz_localize(None)
+        return df
+
+    @staticmethod
+    def _empty_frame(price_col: str) -> pd.DataFrame:
+        """DataFrame vide au même format que les données en cache."""
+        import pandas as pd
+
+        return pd.DataFrame({price_col: []}, index=pd.DatetimeIndex([]))
+
+    def _remove_stale_cache(self, ticker: str, price_col: str, keep: Path) -> None:
+        """Supprime les anciens fichiers cache d'un couple (ticker, price_col)."""
+        for file_path in self.cache_dir.glob(f"{ticker}_{price_col}_*.pkl"):
+            if file_path != keep:
+                file_path.unlink(missing_ok=True)
+
+    def _read_cached_series(
+        self,
+        ticker: str,
+        price_col: str,
+        dates: tuple[str, str]
+    ) -> PriceSeries | None:
+        """
+        Sert une requête entièrement couverte par le cache sans importer pandas.
+
+        Les dates sont comparées en chaînes ISO 'YYYY-MM-DD' (l'ordre
+        lexicographique est l'ordre chronologique). Renvoie None si aucune
+        entrée ne contient la requête ou si l'entrée n'a pas de dates :
+        `fetch_single_ticker` passe alors par le chemin complet.
+        """
+        start = date.fromisoformat(dates[0]).isoformat()
+        end = date.fromisoformat(dates[1]).isoformat()
+
+        for file_path in self.cache_dir.glob(f"{ticker}_{price_col}_*.pkl"):
+            name_parts = file_path.stem.split('_')
+            if len(name_parts) < 4 or name_parts[1] != price_col:
+                continue
+            try:
+                cached_start = date.fromisoformat(name_parts[2]).isoformat()
+                cached_end = date.fromisoformat(name_parts[3]).isoformat()
+                if not (cached_start <= start and cached_end >= end):
+                    continue
+                with open(file_path, 'rb') as f:
+                    data = pickle.load(f)
+            except (FileNotFoundError, ValueError, EOFError, pickle.UnpicklingError):
+                # Nom inattendu, fichier remplacé ou corrompu : chemin complet
+                continue
+
+            if data.get('dates') is None:
+                return None
+            # str()[:10] accepte aussi des dates ou Timestamps stockés tels quels
+            iso_dates = [str(d)[:10] for d in data['dates']]
+            selected = [i for i, d in enumerate(iso_dates) if start <= d <= end]
+            return PriceSeries(
+                [data['prices'][i] for i in selected],
+                ticker,
+                dates=[date.fromisoformat(iso_dates[i]) for i in selected],
+            )
+        return None
+
     def fetch_single_ticker(
         self, 
         ticker: str, 
@@ -221,31 +444,112 @@ class DataLoader:
         Returns:
             Instance de PriceSeries ou None si échec
         """
+        # Chemin rapide sans pandas : requête entièrement couverte par le cache
+        series = self._read_cached_series(ticker, price_col, dates)
+        if series is not None:
+            return series
+
+        import pandas as pd
+
         # Conversion des dates en Timestamp
+        start_date = pd.Timestamp(dates[0])
+        end_date = pd.Timestamp(dates[1])
+
+        # Vérifier le cache (sans verrou : les fichiers sont écrits atomiquement)
+        cached_df, status, gap = self._load_from_cache(ticker, price_col, start_date, end_date)
+        if status in ("exact", "contains"):
+            return self._resolve_request(ticker, price_col, dates, cached_df, status, gap)
+
+        # Single-flight : un seul processus fetch un couple (ticker, price_col) à la fois
+        with self._cache_lock(ticker, price_col):
+            # Double vérification : un autre processus a pu compléter
+            # le cache pendant l'attente du verrou
+            cached_df, status, gap = self._load_from_cache(ticker, price_col, start_date, end_date)
+            return self._resolve_request(ticker, price_col, dates, cached_df, status, gap)
+
+    def _resolve_request(
+        self,
+        ticker: str,
+        price_col: str,
+        dates: tuple[str, str],
+        cached_df: pd.DataFrame | None,
+        status: str,
+        gap: tuple | None
+    ) -> PriceSeries | None:
+        """
+        Construit la PriceSeries demandée selon le statut du cache,
+        en téléchargeant et sauvegardant la partie manquante si besoin.
+        """
+        import pandas as pd
+
+        start_date = pd.Timestamp(dates[0])
+        end_date = pd.Timestamp(dates[1])
 
-        # Vérifier le cache
+        if status in ("exact", "contains"):
+            df = cached_df.loc[start_date:end_date]
+            return PriceSeries(df[price_col].tolist(), ticker, dates=list(df.index.date))
 
+        if status.startswith("overlap"):
             # Fetch la partie manquante
+            gap_start, gap_end = gap
+            new_df = self._download(ticker, price_col, gap_start, gap_end)
 
-            # Fusionner le cache avec les nouvelles données
+            # Une période passée sans cotation (week-end, jour férié) est
+            # définitive : l'entrée est étendue pour ne plus la retélécharger.
+            # Un échec, ou une période vide pouvant encore recevoir des
+            # données, laisse l'entrée telle quelle : son nom couvrirait
+            # sinon des dates jamais récupérées.
+            if new_df is None or (new_df.empty and gap_end >= pd.Timestamp.today().normalize()):
+                self.logger.warning(f"Pas de données complémentaires pour {ticker} sur {gap_start:%Y-%m-%d}..{gap_end:%Y-%m-%d}")
+                df = cached_df.loc[start_date:end_date]
+                return PriceSeries(df[price_col].tolist(), ticker, dates=list(df.index.date))
 
+            # Fusionner le cache avec les nouvelles données
+            if new_df.empty:
+                df = cached_df
+            elif status == "overlap_after":
                 # Concaténation à droite
-
+                df = pd.concat([cached_df, new_df])
+            else:
                 # Ou concaténation à gauche
+                df = pd.concat([new_df, cached_df])
 
             # Supprimer les doublons et trier par date
+            df = df[~df.index.duplicated(keep="last")].sort_index()
 
             # Sauvegarder le cache étendu
+            new_dates = (
+                min(start_date, cached_df.index[0]).strftime("%Y-%m-%d"),
+                max(end_date, cached_df.index[-1]).strftime("%Y-%m-%d"),
+            )
+            cache_path = self._get_cache_path(ticker, price_col, new_dates)
+            self._save_to_cache(
+                cache_path, df[price_col].tolist(), df.index.strftime("%Y-%m-%d").tolist(),
+                ticker, price_col, *new_dates
+            )
+            self._remove_stale_cache(ticker, price_col, keep=cache_path)
 
             # Retourner l'objet price series
+            df = df.loc[start_date:end_date]
+            return PriceSeries(df[price_col].tolist(), ticker, dates=list(df.index.date))
 
-        # else:  # miss: pas de données en cache
-            # fetch toutes les données avec yfinance
+        # miss: pas de données en cache, fetch toutes les données avec yfinance
+        df = self._download(ticker, price_col, start_date, end_date)
+        if df is None:
+            return None
+        if df.empty:
+            self.logger.warning(f"Aucune donnée pour {ticker} sur {dates}")
+            return None
 
-            # Sauvegarder dans le cache
+        # Sauvegarder dans le cache
+        cache_path = self._get_cache_path(ticker, price_col, dates)
+        self._save_to_cache(
+            cache_path, df[price_col].tolist(), df.index.strftime("%Y-%m-%d").tolist(),
+            ticker, price_col, *dates
+        )
 
-            # renvoyer PriceSeries avec la série de prix
-        pass
+        # renvoyer PriceSeries avec la série de prix
+        return PriceSeries(df[price_col].tolist(), ticker, dates=list(df.index.date))
     
     def fetch_multiple_tickers(
         self,
@@ -261,18 +565,127 @@ class DataLoader:
         """
         results = {}
         for ticker in tickers:
-            ps = self.fetch_single_ticker(ticker, price_col, dateps)
+            ps = self.fetch_single_ticker(ticker, price_col, dates)
             if ps is not None:
                 results[ticker] = ps
         return results
     
-    def clear_cache(self) -> int:
+    def get_metrics(
+        self,
+        ticker: str,
+        price_col: str,
+        series: PriceSeries,
+        risk_free_rate: float = 0.0
+    ) -> dict[str, float]:
+        """
+        Métriques d'une série, lues depuis le cache si déjà calculées.
+
+        Les métriques sont indexées par une empreinte du contenu de la série
+        et des paramètres (taux sans risque, TRADING_DAYS_PER_YEAR) : une
+        série modifiée ou étendue n'utilise jamais de valeurs périmées.
+
+        Args:
+            ticker: Symbole (ex: 'AAPL')
+            price_col: Nom de la colonne prix
+            series: Série de prix dont on veut les métriques
+            risk_free_rate: Taux sans risque annuel pour le Sharpe
+
+        Returns:
+            Dictionnaire {nom de métrique: valeur}
+
+        Raises:
+            ValueError: Si la série est trop courte pour les métriques
+        """
+        metrics_path = self._get_metrics_path(ticker, price_col)
+        key = metrics_key(series, risk_free_rate)
+
+        # Lecture sans verrou : les clés dépendent du contenu, un hit est toujours valide
+        stored = self._read_metrics(metrics_path)
+        if key in stored:
+            return stored[key]
+
+        # Lecture-calcul-écriture sous verrou, comme dans `_resolve_request` :
+        # sans lui, deux processus perdraient l'entrée de l'autre et un
+        # fichier supprimé par `_save_to_cache` pourrait être réécrit
+        with self._cache_lock(ticker, price_col):
+            stored = self._read_metrics(metrics_path)
+            if key not in stored:
+                stored[key] = compute_metrics(series, risk_free_rate)
+                self._atomic_dump(metrics_path, stored)
+                self.logger.debug(f"Métriques sauvegardées: {metrics_path}")
+            return stored[key]
+
+    def _read_metrics(self, metrics_path: Path) -> dict[str, dict[str, float]]:
+        """Métriques stockées {clé: métriques}, vide si le fichier manque ou est corrompu."""
+        try:
+            with open(metrics_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            # Pas encore calculées, ou supprimées (entrée de cache étendue)
+            return {}
+        except (EOFError, pickle.UnpicklingError) as e:
+            self.logger.warning(f"Fichier métriques corrompu {metrics_path}: {e}")
+            return {}
+
+    def fetch_metrics(
+        self,
+        tickers: Sequence[str],
+        price_col: str,
+        dates: tuple[str, str],
+        risk_free_rate: float = 0.0
+    ) -> dict[str, dict[str, float]]:
+        """
+        Récupère les prix puis les métriques de plusieurs tickers.
+
+        Les tickers sans données ou avec une série trop courte sont ignorés.
+
+        Returns:
+            Dictionnaire {ticker: {nom de métrique: valeur}}
+        """
+        results = {}
+        for ticker, ps in self.fetch_multiple_tickers(tickers, price_col, dates).items():
+            try:
+                results[ticker] = self.get_metrics(ticker, price_col, ps, risk_free_rate)
+            except ValueError as e:
+                self.logger.warning(f"{ticker}: métriques non calculables ({e})")
+        return results
+
+    def clear_cache(self, tmp_max_age: float = 60.0) -> int:
         """
         Supprime tous les fichiers du cache.
-        
+
+        Les prix (.pkl) et métriques (.metrics) sont supprimés. Les fichiers
+        temporaires (.tmp) orphelins, laissés par un processus interrompu
+        pendant `_atomic_dump`, sont supprimés s'ils ont plus de `tmp_max_age`
+        secondes : un fichier plus récent peut être une écriture en cours.
+        Les verrous (.lock) sont supprimés s'ils sont libres (voir `_remove_free_lock`).
+
+        Args:
+            tmp_max_age: Âge minimal en secondes d'un .tmp pour être considéré orphelin
+
         Returns:
             Nombre de fichiers supprimés
         """
         # Itérer sur les fichiers d'un directory tout en vérifiant le suffix
-            # supprimer
-        # Renvoyer le nombre de fichier supprimé
\ No newline at end of file
+        count = 0
+        now = datetime.now().timestamp()
+        for file_path in self.cache_dir.iterdir():
+            if not file_path.is_file():
+                continue
+            if file_path.suffix in (".pkl", ".metrics"):
+                # supprimer
+                file_path.unlink(missing_ok=True)
+                count += 1
+            elif file_path.suffix == ".tmp" and file_path.name.startswith("."):
+                try:
+                    if now - file_path.stat().st_mtime < tmp_max_age:
+                        continue
+                    file_path.unlink()
+                except FileNotFoundError:
+                    # Renommé ou supprimé entre-temps par son processus
+                    continue
+                count += 1
+            elif file_path.suffix == ".lock" and self._remove_free_lock(file_path):
+                count += 1
+        # Renvoyer le nombre de fichier supprimé
+        return count
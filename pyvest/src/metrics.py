@@ -0,0 +1,46 @@
+from array import array
+import hashlib
+
+from .priceseries import PriceSeries
+
+METRIC_NAMES = [
+    "n_prices",
+    "last_price",
+    "total_return",
+    "annualized_return",
+    "volatility",
+    "sharpe_ratio",
+    "max_drawdown",
+]
+
+
+def compute_metrics(series: PriceSeries, risk_free_rate: float = 0.0) -> dict[str, float]:
+    """
+    Calcule les métriques usuelles d'une série de prix.
+
+    Raises:
+        ValueError: Si la série est trop courte pour les métriques
+    """
+    return {
+        "n_prices": len(series),
+        "last_price": series.values[-1],
+        "total_return": series.total_return,
+        "annualized_return": series.get_annualized_return(),
+        "volatility": series.get_annualized_volatility(),
+        "sharpe_ratio": series.sharpe_ratio(risk_free_rate),
+        "max_drawdown": series.max_drawdown(),
+    }
+
+
+def metrics_key(series: PriceSeries, risk_free_rate: float = 0.0) -> str:
+    """
+    Empreinte du contenu de la série et des paramètres de calcul.
+
+    Deux séries de prix identiques calculées avec le même taux sans risque
+    et le même TRADING_DAYS_PER_YEAR ont la même clé ; toute modification
+    d'un prix (ou extension de la série) change la clé.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(array("d", series.values).tobytes())
+    h.update(f"|rf={risk_free_rate!r}|days={series.TRADING_DAYS_PER_YEAR!r}".encode())
+    return h.hexdigest()
@@ -7,15 +7,37 @@ class PriceSeries:
     Attributes:
         values: Liste de prix indexés par le temps
         name: Identifiant de la série
+        dates: Dates des prix (optionnelles, même longueur que values)
    
     Class Attributes:
         TRADING_DAYS_PER_YEAR: Constante d'annualisation
         (convention US equities, peut varier selon l'actif)
     """
     TRADING_DAYS_PER_YEAR = 252
-    def __init__(self, values: list[float], name: str | None) -> None:
+    def __init__(
+        self,
+        values: list[float],
+        name: str | None,
+        dates: list | None = None,
+        periods_per_year: float | None = None
+    ) -> None:
+        """
+        Args:
+            values: Prix
+            name: Identifiant de la série
+            dates: Dates des prix (optionnelles)
+            periods_per_year: Facteur d'annualisation propre à la série
+                (ex: 365 pour une crypto, 52 pour des prix hebdomadaires).
+                Par défaut TRADING_DAYS_PER_YEAR.
+        """
         self.name = name
         self.values = list(values)
+        self.dates = list(dates) if dates is not None else None
+        if self.dates is not None and len(self.dates) != len(self.values):
+            raise ValueError("dates et values doivent avoir la même longueur")
+        if periods_per_year is not None:
+            # Surcharge d'instance : toutes les méthodes lisent self.TRADING_DAYS_PER_YEAR
+            self.TRADING_DAYS_PER_YEAR = periods_per_year
  
     def __repr__(self):
         """Représentation pour les développeurs (debugging)."""
@@ -0,0 +1,126 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .priceseries import PriceSeries
+from .returns import log_returns_panel
+
+
+def _design(
+    assets: Iterable,
+    benchmarks: Iterable
+) -> tuple[list[str], list[str], np.ndarray, np.ndarray]:
+    """
+    Log-rendements alignés des actifs (Y) et des facteurs avec constante (X).
+
+    Actifs et facteurs passent ensemble dans `log_returns_panel`, donc
+    tous sont alignés sur leurs dates communes (ou leurs observations
+    les plus récentes pour des séries sans dates).
+    """
+    assets, benchmarks = list(assets), list(benchmarks)
+    if not benchmarks:
+        raise ValueError("Aucun facteur fourni")
+
+    tickers, returns = log_returns_panel(assets + benchmarks)
+    n = len(assets)
+    x = np.column_stack([np.ones(len(returns)), returns[:, n:]])
+    return tickers[:n], tickers[n:], x, returns[:, :n]
+
+
+def regress(
+    assets: Iterable,
+    benchmarks: Iterable,
+    periods_per_year: float = PriceSeries.TRADING_DAYS_PER_YEAR
+) -> pd.DataFrame:
+    """
+    Régresse les log-rendements de tous les actifs sur un ou plusieurs facteurs.
+
+        r_i = α_i + Σ_k β_ik·f_k + ε_i
+
+    Une seule résolution des moindres carrés traite toutes les colonnes :
+    np.linalg.lstsq(X, Y) avec Y de forme (T, N).
+
+    Args:
+        assets: Itérable d'Asset à expliquer (une Universe convient)
+        benchmarks: Itérable d'Asset servant de facteurs (ex: SPY)
+        periods_per_year: Facteur d'annualisation de alpha et de la vol résiduelle
+
+    Returns:
+        DataFrame indexé par ticker avec colonnes alpha (annualisé),
+        beta_<facteur>, residual_vol (annualisée) et r2
+
+    Raises:
+        ValueError: S'il y a moins d'observations que de paramètres + 1
+    """
+    tickers, factors, x, y = _design(assets, benchmarks)
+    t, p = x.shape
+    if t <= p:
+        raise ValueError(f"Pas assez d'observations: {t} pour {p} paramètres")
+
+    coefs, _, _, _ = np.linalg.lstsq(x, y, rcond=None)
+    residuals = y - x @ coefs
+    ssr = np.einsum("ij,ij->j", residuals, residuals)
+    centered = y - y.mean(axis=0)
+    sst = np.einsum("ij,ij->j", centered, centered)
+
+    result = {"alpha": coefs[0] * periods_per_year}
+    for k, factor in enumerate(factors, start=1):
+        result[f"beta_{factor}"] = coefs[k]
+    result["residual_vol"] = np.sqrt(ssr / (t - p) * periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["r2"] = 1.0 - ssr / sst
+    return pd.DataFrame(result, index=tickers)
+
+
+def rolling_regress(
+    assets: Iterable,
+    benchmarks: Iterable,
+    window: int,
+    periods_per_year: float = PriceSeries.TRADING_DAYS_PER_YEAR
+) -> dict[str, pd.DataFrame]:
+    """
+    Régression sur fenêtre glissante par sommes cumulées des produits croisés.
+
+    XᵀX et XᵀY de chaque fenêtre s'obtiennent par différence de sommes
+    cumulées, en O(T·p·(p+N)) au total quelle que soit la taille de fenêtre,
+    puis toutes les équations normales sont résolues en un appel batché.
+
+    Args:
+        assets: Itérable d'Asset à expliquer (une Universe convient)
+        benchmarks: Itérable d'Asset servant de facteurs
+        window: Nombre d'observations par fenêtre
+        periods_per_year: Facteur d'annualisation de alpha
+
+    Returns:
+        Dictionnaire {'alpha', 'beta_<facteur>', ...} de DataFrames
+        (T - window + 1, N) indexés par la position du dernier rendement
+        de chaque fenêtre ; NaN pour les fenêtres où XᵀX est singulière
+        (facteur constant, ex: prix plats ou remplis, ou facteurs colinéaires)
+    """
+    tickers, factors, x, y = _design(assets, benchmarks)
+    t, p = x.shape
+    if not p < window <= t:
+        raise ValueError(f"window doit être compris entre {p + 1} et {t}")
+
+    def window_sums(products: np.ndarray) -> np.ndarray:
+        cum = np.cumsum(products, axis=0)
+        cum = np.concatenate([np.zeros((1,) + cum.shape[1:]), cum])
+        return cum[window:] - cum[:-window]
+
+    xtx = window_sums(x[:, :, None] * x[:, None, :])  # (T-w+1, p, p)
+    xty = window_sums(x[:, :, None] * y[:, None, :])  # (T-w+1, p, N)
+
+    # Un facteur constant est détecté exactement : par différence de sommes
+    # cumulées, sa variance n'est nulle qu'aux erreurs d'arrondi près
+    flat = (np.ptp(sliding_window_view(x[:, 1:], window, axis=0), axis=-1) == 0).any(axis=1)
+    singular = flat | (np.linalg.matrix_rank(xtx) < p)
+    coefs = np.full(xty.shape, np.nan)
+    coefs[~singular] = np.linalg.solve(xtx[~singular], xty[~singular])
+
+    index = pd.RangeIndex(window - 1, t, name="end")
+    result = {"alpha": pd.DataFrame(coefs[:, 0] * periods_per_year, index=index, columns=tickers)}
+    for k, factor in enumerate(factors, start=1):
+        result[f"beta_{factor}"] = pd.DataFrame(coefs[:, k], index=index, columns=tickers)
+    return result
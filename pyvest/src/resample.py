@@ -0,0 +1,347 @@
+from typing import Iterable
+
+import numpy as np
+
+from .constant import CurrencyEnum
+from .priceseries import PriceSeries
+
+# Nombre de périodes par an pour les fréquences non quotidiennes
+PERIODS_PER_YEAR = {"W": 52, "M": 12, "Q": 4, "Y": 1}
+FREQUENCIES = ("D", *PERIODS_PER_YEAR)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> np.datetime64:
+    """n-ième jour de semaine (0 = lundi) d'un mois."""
+    first = np.datetime64(f"{year}-{month:02d}-01")
+    # 1970-01-01 était un jeudi (weekday 3)
+    offset = (weekday - (first.astype(int) + 3) % 7) % 7
+    return first + np.timedelta64(offset + 7 * (n - 1), "D")
+
+
+# Jours fériés nationaux à date fixe : (mois-jour, première année, dernière année)
+_JP_FIXED_HOLIDAYS = [
+    ("01-01", 1949, None),
+    ("01-15", 1949, 1999),  # Seijin no Hi, lundi mobile ensuite
+    ("02-11", 1967, None),
+    ("02-23", 2020, None),  # Anniversaire de l'empereur (Naruhito)
+    ("04-29", 1949, None),
+    ("05-03", 1949, None),
+    ("05-04", 2007, None),  # Midori no Hi (jour « pris en sandwich » avant 2007)
+    ("05-05", 1949, None),
+    ("07-20", 1996, 2002),  # Umi no Hi, lundi mobile ensuite
+    ("08-11", 2016, None),  # Yama no Hi
+    ("09-15", 1966, 2002),  # Keirō no Hi, lundi mobile ensuite
+    ("10-10", 1966, 1999),  # Taiiku no Hi, lundi mobile ensuite
+    ("11-03", 1948, None),
+    ("11-23", 1948, None),
+    ("12-23", 1989, 2018),  # Anniversaire de l'empereur (Akihito)
+]
+# « Happy Monday » : (mois, rang du lundi, première année)
+_JP_MONDAY_HOLIDAYS = [(1, 2, 2000), (7, 3, 2003), (9, 3, 2003), (10, 2, 2000)]
+# Fêtes déplacées pour les Jeux olympiques de Tokyo
+_JP_MOVED_HOLIDAYS = {
+    2020: {"07-20": "07-23", "08-11": "08-10", "10-12": "07-24"},
+    2021: {"07-19": "07-22", "08-11": "08-08", "10-11": "07-23"},
+}
+# Jours fériés exceptionnels (cérémonies impériales)
+_JP_SPECIAL_HOLIDAYS = ["1990-11-12", "1993-06-09", "2019-05-01", "2019-10-22"]
+# Fermetures propres à la bourse : ce ne sont pas des jours fériés, pas de report
+_JPX_CLOSURES = ["01-02", "01-03", "12-31"]
+
+
+def _jp_national_holidays(year: int) -> list[np.datetime64]:
+    """Jours fériés nationaux japonais d'une année, sans les jours de report."""
+    days = [
+        f"{year}-{md}" for md, first, last in _JP_FIXED_HOLIDAYS
+        if first <= year and (last is None or year <= last)
+    ]
+    days += [
+        str(_nth_weekday(year, month, 0, n))
+        for month, n, first in _JP_MONDAY_HOLIDAYS if year >= first
+    ]
+    moved = _JP_MOVED_HOLIDAYS.get(year, {})
+    days = [f"{year}-{moved.get(d[5:], d[5:])}" for d in days]
+
+    leap = int((year - 1980) / 4)
+    days.append(f"{year}-03-{int(20.8431 + 0.242194 * (year - 1980)) - leap:02d}")
+    days.append(f"{year}-09-{int(23.2488 + 0.242194 * (year - 1980)) - leap:02d}")
+    days += [d for d in _JP_SPECIAL_HOLIDAYS if d.startswith(f"{year}-")]
+    return sorted(np.datetime64(d) for d in days)
+
+
+def japanese_holidays(years: Iterable[int]) -> np.ndarray:
+    """
+    Jours de fermeture de la bourse de Tokyo.
+
+    Jours fériés nationaux selon leurs années d'application (dates fixes,
+    « Happy Monday » depuis 2000/2003, équinoxes par une formule valable
+    1980-2099), jours pris entre deux fériés, reports du dimanche et
+    fermetures de fin d'année de la bourse (31 décembre au 3 janvier).
+    """
+    one_day = np.timedelta64(1, "D")
+    days = []
+    for y in years:
+        national = _jp_national_holidays(y)
+        holidays = set(national)
+        # Jour ordinaire pris entre deux jours fériés (depuis 1988)
+        if y >= 1988:
+            holidays |= {
+                d + one_day for d in national
+                if d + 2 * one_day in national and d + one_day not in national
+            }
+        # Férié national tombant un dimanche : reporté au lundi, ou depuis
+        # 2007 au premier jour non férié suivant
+        for d in national:
+            if (d.astype(int) + 3) % 7 != 6 or y < 1973:
+                continue
+            substitute = d + one_day
+            if y >= 2007:
+                while substitute in holidays:
+                    substitute += one_day
+            if substitute not in holidays:
+                holidays.add(substitute)
+        days += holidays
+        days += [np.datetime64(f"{y}-{md}") for md in _JPX_CLOSURES]
+    return np.unique(np.array(days, dtype="datetime64[D]"))
+
+
+class TradingCalendar:
+    """
+    Calendrier de cotation d'un marché.
+
+    S'appuie sur numpy.busdaycalendar : les tests de jour ouvré
+    (np.is_busday) sont vectorisés sur des tableaux de dates.
+
+    Attributes:
+        name: Nom du calendrier
+        periods_per_year: Facteur d'annualisation des données quotidiennes
+        weekmask: Jours de cotation ('1111100' = lundi à vendredi)
+        holidays: Jours fériés (datetime64[D])
+    """
+
+    def __init__(
+        self,
+        name: str,
+        periods_per_year: float,
+        weekmask: str = "1111100",
+        holidays: Iterable | None = None
+    ) -> None:
+        self.name = name
+        self.periods_per_year = periods_per_year
+        self.weekmask = weekmask
+        self.holidays = np.array(
+            list(holidays) if holidays is not None else [], dtype="datetime64[D]"
+        )
+        self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+    def __repr__(self) -> str:
+        return f"TradingCalendar({self.name!r}, {self.periods_per_year} periods/year)"
+
+    def is_session(self, dates) -> np.ndarray:
+        """Masque booléen des dates qui sont des jours de cotation."""
+        return np.is_busday(np.asarray(dates, dtype="datetime64[D]"), busdaycal=self._busdaycal)
+
+    def sessions(self, start, end) -> np.ndarray:
+        """Jours de cotation entre start et end inclus."""
+        days = np.arange(
+            np.datetime64(start, "D"), np.datetime64(end, "D") + np.timedelta64(1, "D")
+        )
+        return days[self.is_session(days)]
+
+
+NYSE = TradingCalendar("NYSE", 252)
+EURONEXT = TradingCalendar("EURONEXT", 252)
+LSE = TradingCalendar("LSE", 252)
+JPX = TradingCalendar("JPX", 245, holidays=japanese_holidays(range(1990, 2051)))
+CRYPTO = TradingCalendar("CRYPTO", 365, weekmask="1111111")
+
+CURRENCY_CALENDARS = {
+    CurrencyEnum.USD: NYSE,
+    CurrencyEnum.EUR: EURONEXT,
+    CurrencyEnum.GBP: LSE,
+    CurrencyEnum.JPY: JPX,
+}
+
+
+def periods_per_year(freq: str, calendar: TradingCalendar = NYSE) -> float:
+    """Facteur d'annualisation d'une fréquence ('D', 'W', 'M', 'Q', 'Y')."""
+    if freq == "D":
+        return calendar.periods_per_year
+    try:
+        return PERIODS_PER_YEAR[freq]
+    except KeyError:
+        raise ValueError(f"Fréquence inconnue: {freq!r} (attendu: {', '.join(FREQUENCIES)})") from None
+
+
+def _period_starts(dates: np.ndarray, freq: str) -> np.ndarray:
+    """
+    Indices du début de chaque période dans un tableau de dates trié.
+
+    Chaque date est convertie en code entier de période ; une nouvelle
+    période commence là où le code change.
+    """
+    if freq == "D":
+        codes = dates.astype(np.int64)
+    elif freq == "W":
+        # Semaines commençant le lundi (1970-01-01 était un jeudi)
+        codes = (dates.astype(np.int64) + 3) // 7
+    elif freq == "M":
+        codes = dates.astype("datetime64[M]").astype(np.int64)
+    elif freq == "Q":
+        codes = dates.astype("datetime64[M]").astype(np.int64) // 3
+    elif freq == "Y":
+        codes = dates.astype("datetime64[Y]").astype(np.int64)
+    else:
+        raise ValueError(f"Fréquence inconnue: {freq!r} (attendu: {', '.join(FREQUENCIES)})")
+    return np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+
+def resample_panel(
+    dates,
+    prices: np.ndarray,
+    freq: str,
+    how: str = "last"
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Agrège des prix (T,) ou (T, N) à une fréquence plus basse.
+
+    Toutes les colonnes sont traitées en une passe : les agrégats
+    sont des sélections d'indices ou des ufunc.reduceat sur l'axe du temps.
+    Un NaN marque une observation absente (ex: week-end d'une action dans
+    un panel contenant une crypto) : il est ignoré, et une période sans
+    aucune observation pour une colonne donne NaN.
+
+    Args:
+        dates: Dates triées (T,)
+        prices: Prix (T,) ou (T, N)
+        freq: 'D', 'W', 'M', 'Q' ou 'Y'
+        how: 'last', 'first', 'high', 'low' ou 'mean'
+
+    Returns:
+        tuple: (period_dates, resampled)
+        - period_dates: Dernière date observée de chaque période
+        - resampled: Prix agrégés (P,) ou (P, N)
+
+    Raises:
+        ValueError: Si dates est vide, non triée ou de longueur différente de prices
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    prices = np.asarray(prices, dtype=float)
+    if len(dates) != len(prices):
+        raise ValueError("dates et prices doivent avoir la même longueur")
+    if len(dates) == 0:
+        raise ValueError("Aucune observation à rééchantillonner")
+    if np.any(dates[1:] < dates[:-1]):
+        raise ValueError("Les dates doivent être triées")
+
+    starts = _period_starts(dates, freq)
+    ends = np.r_[starts[1:], len(dates)] - 1
+    valid = ~np.isnan(prices)
+
+    if how in ("last", "first"):
+        # Position de la dernière (ou première) observation valide de chaque période
+        rows = np.arange(len(dates)).reshape((-1,) + (1,) * (prices.ndim - 1))
+        if how == "last":
+            pos = np.maximum.reduceat(np.where(valid, rows, -1), starts, axis=0)
+        else:
+            pos = np.minimum.reduceat(np.where(valid, rows, len(dates)), starts, axis=0)
+        found = (pos >= 0) & (pos < len(dates))
+        values = np.take_along_axis(prices, np.where(found, pos, 0), axis=0)
+        values[~found] = np.nan
+    elif how == "high":
+        values = np.fmax.reduceat(prices, starts, axis=0)
+    elif how == "low":
+        values = np.fmin.reduceat(prices, starts, axis=0)
+    elif how == "mean":
+        counts = np.add.reduceat(valid, starts, axis=0)
+        with np.errstate(invalid="ignore"):
+            values = np.add.reduceat(np.where(valid, prices, 0.0), starts, axis=0) / counts
+    else:
+        raise ValueError(f"Agrégation inconnue: {how!r}")
+    return dates[ends], values
+
+
+def ohlc_panel(dates, prices: np.ndarray, freq: str) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Barres open/high/low/close par période à partir de prix (T,) ou (T, N).
+
+    Returns:
+        tuple: (period_dates, {'open', 'high', 'low', 'close'})
+    """
+    bars = {}
+    for key, how in (("open", "first"), ("high", "high"), ("low", "low"), ("close", "last")):
+        period_dates, bars[key] = resample_panel(dates, prices, freq, how)
+    return period_dates, bars
+
+
+def resample_series(
+    series: PriceSeries,
+    freq: str,
+    how: str = "last",
+    calendar: TradingCalendar = NYSE
+) -> PriceSeries:
+    """
+    Rééchantillonne une PriceSeries datée.
+
+    Les observations hors des jours de cotation du calendrier sont écartées
+    puis les prix sont agrégés ; le facteur d'annualisation de la série
+    obtenue est déduit de la fréquence (ex: 52 en hebdomadaire, 365 pour
+    une crypto en quotidien).
+
+    Raises:
+        ValueError: Si la série n'a pas de dates ou aucun jour de cotation
+    """
+    if series.dates is None:
+        raise ValueError(f"La série {series.name!r} n'a pas de dates")
+
+    dates = np.asarray(series.dates, dtype="datetime64[D]")
+    prices = np.asarray(series.values, dtype=float)
+    sessions = calendar.is_session(dates)
+
+    period_dates, values = resample_panel(dates[sessions], prices[sessions], freq, how)
+    return PriceSeries(
+        values.tolist(),
+        series.name,
+        dates=period_dates.tolist(),
+        periods_per_year=periods_per_year(freq, calendar),
+    )
+
+
+def resample_assets(
+    assets: Iterable,
+    freq: str,
+    how: str = "last"
+) -> tuple[np.ndarray, list[str], np.ndarray]:
+    """
+    Rééchantillonne un univers en une passe sur le panel de prix.
+
+    Les séries sont placées sur l'union de leurs dates ; chaque actif n'y
+    garde que les jours de cotation de son propre calendrier (`Asset.calendar`),
+    les autres cases valent NaN. Une crypto conserve ainsi ses barres du
+    week-end à côté d'actions cotées du lundi au vendredi.
+
+    Returns:
+        tuple: (period_dates, tickers, resampled) avec resampled de forme (P, N),
+        NaN pour une période sans observation d'un actif
+
+    Raises:
+        ValueError: Si un actif n'a pas de dates ou s'il ne reste aucune observation
+    """
+    assets = list(assets)
+    all_dates = []
+    for a in assets:
+        if a.prices.dates is None:
+            raise ValueError(f"La série de {a.ticker} n'a pas de dates")
+        all_dates.append(np.asarray(a.prices.dates, dtype="datetime64[D]"))
+
+    union = np.unique(np.concatenate(all_dates)) if all_dates else np.array([], dtype="datetime64[D]")
+    panel = np.full((len(union), len(assets)), np.nan)
+    for j, (a, d) in enumerate(zip(assets, all_dates)):
+        sessions = a.calendar.is_session(d)
+        idx = np.searchsorted(union, d[sessions])
+        panel[idx, j] = np.asarray(a.prices.values, dtype=float)[sessions]
+
+    # Dates qui ne sont un jour de cotation pour aucun actif
+    observed = ~np.isnan(panel).all(axis=1)
+    period_dates, values = resample_panel(union[observed], panel[observed], freq, how)
+    return period_dates, [a.ticker for a in assets], values
@@ -0,0 +1,59 @@
+from typing import Iterable
+
+import numpy as np
+
+
+def log_returns_panel(assets: Iterable) -> tuple[list[str], np.ndarray]:
+    """
+    Construit le panel des log-rendements d'un ensemble d'actifs.
+
+    Si toutes les séries sont datées, elles sont alignées sur les dates
+    communes (jointure interne) : chaque ligne est le log-rendement entre
+    deux dates communes consécutives. Sinon, on conserve les n observations
+    les plus récentes de chaque série, n étant la longueur de la plus courte,
+    en supposant que toutes les séries se terminent à la même date.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+
+    Returns:
+        tuple: (tickers, returns)
+        - tickers: Liste des tickers dans l'ordre des colonnes
+        - returns: Matrice (T, N) des log-rendements, la plus ancienne en premier
+
+    Raises:
+        ValueError: Si l'univers est vide ou s'il y a moins de 2 observations communes
+    """
+    assets = list(assets)
+    if not assets:
+        raise ValueError("Aucun actif fourni")
+
+    tickers = [a.ticker for a in assets]
+    if all(a.prices.dates is not None for a in assets):
+        all_dates = [np.asarray(a.prices.dates, dtype="datetime64[D]") for a in assets]
+        common = all_dates[0]
+        for d in all_dates[1:]:
+            common = np.intersect1d(common, d)
+
+        prices = np.empty((len(common), len(assets)))
+        for j, (a, d) in enumerate(zip(assets, all_dates)):
+            # Indices (dans l'ordre de common, trié) des dates communes de la série
+            _, _, idx = np.intersect1d(common, d, assume_unique=True, return_indices=True)
+            prices[:, j] = np.asarray(a.prices.values, dtype=float)[idx]
+        series = list(np.diff(np.log(prices), axis=0).T)
+    else:
+        # np.diff(np.log(p)) donne les mêmes valeurs que get_all_log_returns()
+        # sans boucle Python par observation
+        series = [np.diff(np.log(np.asarray(a.prices.values, dtype=float))) for a in assets]
+
+    n = min(len(s) for s in series)
+    if n < 2:
+        raise ValueError(
+            f"Pas assez d'observations communes: {n}. "
+            "Minimum requis: 2."
+        )
+
+    returns = np.empty((n, len(assets)))
+    for j, s in enumerate(series):
+        returns[:, j] = s[len(s) - n:]
+    return tickers, returns
@@ -0,0 +1,164 @@
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.stats import norm
+
+from .returns import log_returns_panel
+
+METHODS = ("historical", "parametric", "cornish_fisher")
+
+
+def _var_cvar(
+    returns: np.ndarray,
+    confidence: float,
+    method: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    VaR et CVaR le long du dernier axe d'un tableau (..., T).
+
+    Les deux mesures sont exprimées en pertes positives de log-rendement.
+    """
+    alpha = 1.0 - confidence
+    t = returns.shape[-1]
+
+    if method == "historical":
+        # Sélection partielle en O(T) : les k+1 pires rendements sont
+        # placés en tête sans trier le reste de la série
+        # (arrondi : 1 - 0.95 vaut 0.05000000000000004 en flottant)
+        k = max(int(np.ceil(round(alpha * t, 9))) - 1, 0)
+        tail = np.partition(returns, k, axis=-1)[..., :k + 1]
+        return -tail[..., k], -tail.mean(axis=-1)
+
+    mean = returns.mean(axis=-1)
+    # Même estimateur que get_annualized_volatility (ddof=1), non annualisé
+    std = returns.std(axis=-1, ddof=1)
+    z = norm.ppf(alpha)
+    phi = norm.pdf(z)
+
+    if method == "parametric":
+        return -(mean + z * std), -(mean - std * phi / alpha)
+
+    if method == "cornish_fisher":
+        centered = (returns - mean[..., None]) / std[..., None]
+        skew = np.mean(centered**3, axis=-1)
+        kurt = np.mean(centered**4, axis=-1) - 3.0
+        z_cf = (
+            z
+            + (z**2 - 1) * skew / 6
+            + (z**3 - 3 * z) * kurt / 24
+            - (2 * z**3 - 5 * z) * skew**2 / 36
+        )
+        # Moments partiels de la loi normale sous z : E[Z^n 1{Z<z}]
+        m0 = alpha
+        m1 = -phi
+        m2 = alpha - z * phi
+        m3 = -(z**2 + 2) * phi
+        tail_z = (
+            m1
+            + (m2 - m0) * skew / 6
+            + (m3 - 3 * m1) * kurt / 24
+            - (2 * m3 - 5 * m1) * skew**2 / 36
+        ) / alpha
+        return -(mean + z_cf * std), -(mean + tail_z * std)
+
+    raise ValueError(f"Méthode inconnue: {method!r} (attendu: {', '.join(METHODS)})")
+
+
+def _panel_with_basket(
+    assets: Iterable,
+    weights: dict[str, float] | None
+) -> tuple[list[str], np.ndarray]:
+    """Panel (T, N) des log-rendements, avec une colonne panier si weights est fourni."""
+    tickers, returns = log_returns_panel(assets)
+    if weights is None:
+        return tickers, returns
+
+    w = {t.upper(): v for t, v in weights.items()}
+    unknown = set(w) - set(tickers)
+    if unknown:
+        raise ValueError(f"Tickers inconnus dans weights: {', '.join(sorted(unknown))}")
+    # Approximation : rendement du panier = somme pondérée des log-rendements
+    basket = returns @ np.array([w.get(t, 0.0) for t in tickers])
+    return tickers + ["PORTFOLIO"], np.column_stack([returns, basket])
+
+
+def var_cvar(
+    assets: Iterable,
+    confidence: Sequence[float] = (0.95, 0.99),
+    method: str = "historical",
+    weights: dict[str, float] | None = None
+) -> pd.DataFrame:
+    """
+    Value-at-Risk et Expected Shortfall (CVaR) de tous les actifs en une passe.
+
+    Méthodes :
+    - 'historical' : quantile empirique, par sélection partielle (np.partition)
+    - 'parametric' : loi normale avec la volatilité de get_annualized_volatility
+    - 'cornish_fisher' : quantile normal corrigé de l'asymétrie et du kurtosis
+
+    Les mesures portent sur les log-rendements d'une période et sont
+    exprimées en pertes positives.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+        confidence: Niveaux de confiance (ex: 0.95, 0.99)
+        method: 'historical', 'parametric' ou 'cornish_fisher'
+        weights: Poids {ticker: poids} d'un panier, ajouté en ligne 'PORTFOLIO'
+
+    Returns:
+        DataFrame indexé par ticker avec colonnes var_95, cvar_95, var_99, ...
+    """
+    tickers, returns = _panel_with_basket(assets, weights)
+    columns = {}
+    for c in confidence:
+        var, cvar = _var_cvar(returns.T, c, method)
+        columns[f"var_{c * 100:g}"] = var
+        columns[f"cvar_{c * 100:g}"] = cvar
+    return pd.DataFrame(columns, index=tickers)
+
+
+def rolling_var_cvar(
+    assets: Iterable,
+    window: int,
+    confidence: float = 0.99,
+    method: str = "historical",
+    weights: dict[str, float] | None = None,
+    chunk_size: int = 256
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    VaR et CVaR sur fenêtre glissante.
+
+    Les fenêtres sont des vues (sliding_window_view) sans copie ; elles
+    sont traitées par paquets de `chunk_size` pour borner la mémoire.
+
+    Args:
+        assets: Itérable d'Asset (une Universe convient)
+        window: Nombre d'observations par fenêtre
+        confidence: Niveau de confiance
+        method: 'historical', 'parametric' ou 'cornish_fisher'
+        weights: Poids d'un panier, ajouté en colonne 'PORTFOLIO'
+        chunk_size: Nombre de fenêtres calculées à la fois
+
+    Returns:
+        tuple: (var, cvar)
+        - DataFrames (T - window + 1, N) indexés par la position du
+          dernier rendement de chaque fenêtre
+    """
+    tickers, returns = _panel_with_basket(assets, weights)
+    if not 2 <= window <= len(returns):
+        raise ValueError(f"window doit être compris entre 2 et {len(returns)}")
+
+    windows = sliding_window_view(returns, window, axis=0)  # (T-w+1, N, w)
+    var = np.empty(windows.shape[:2])
+    cvar = np.empty(windows.shape[:2])
+    for start in range(0, len(windows), chunk_size):
+        stop = start + chunk_size
+        var[start:stop], cvar[start:stop] = _var_cvar(windows[start:stop], confidence, method)
+
+    index = pd.RangeIndex(window - 1, len(returns), name="end")
+    return (
+        pd.DataFrame(var, index=index, columns=tickers),
+        pd.DataFrame(cvar, index=index, columns=tickers),
+    )
@@ -0,0 +1,227 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable
+import math
+
+import numpy as np
+
+from .covariance import FactorCovariance
+from .priceseries import PriceSeries
+from .returns import log_returns_panel
+
+
+def _to_prices(s0: np.ndarray, log_returns: np.ndarray, terminal_only: bool) -> np.ndarray:
+    """Convertit des log-rendements (paths, horizon, ...) en prix."""
+    if terminal_only:
+        return s0 * np.exp(log_returns.sum(axis=1))
+    paths = np.empty((log_returns.shape[0], log_returns.shape[1] + 1) + log_returns.shape[2:])
+    paths[:, 0] = 0.0
+    np.cumsum(log_returns, axis=1, out=paths[:, 1:])
+    np.exp(paths, out=paths)
+    paths *= s0
+    return paths
+
+
+def _gbm_chunk(
+    size: int,
+    seed: np.random.SeedSequence,
+    horizon: int,
+    terminal_only: bool,
+    s0: float,
+    mu: float,
+    sigma: float
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(mu, sigma, size=(size, horizon))
+    return _to_prices(s0, log_returns, terminal_only)
+
+
+def _bootstrap_chunk(
+    size: int,
+    seed: np.random.SeedSequence,
+    horizon: int,
+    terminal_only: bool,
+    s0: float,
+    history: np.ndarray,
+    block_size: int
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n_blocks = math.ceil(horizon / block_size)
+    starts = rng.integers(0, len(history) - block_size + 1, size=(size, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)).reshape(size, -1)[:, :horizon]
+    return _to_prices(s0, history[idx], terminal_only)
+
+
+def _multi_chunk(
+    size: int,
+    seed: np.random.SeedSequence,
+    horizon: int,
+    terminal_only: bool,
+    s0: np.ndarray,
+    mean: np.ndarray,
+    loadings: np.ndarray,
+    specific_sd: np.ndarray | None
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((size, horizon, loadings.shape[1]))
+    log_returns = factors @ loadings.T
+    log_returns += mean
+    if specific_sd is not None:
+        log_returns += rng.standard_normal(log_returns.shape) * specific_sd
+    return _to_prices(s0, log_returns, terminal_only)
+
+
+class MonteCarloEngine:
+    """
+    Simulation vectorisée de trajectoires de prix futures.
+
+    Les trajectoires sont générées par blocs dont la taille respecte
+    `max_memory_mb`, chaque bloc étant un calcul numpy unique. Chaque bloc
+    reçoit sa propre graine issue de `numpy.random.SeedSequence(seed)` :
+    le découpage ne dépend pas de `n_jobs`, donc les résultats sont
+    identiques en séquentiel et en parallèle.
+
+    Attributes:
+        n_paths: Nombre de trajectoires
+        horizon: Nombre de pas de temps simulés
+        seed: Graine pour la reproductibilité (optionnelle)
+        max_memory_mb: Budget mémoire approximatif par bloc (au moins une trajectoire par bloc)
+        n_jobs: Nombre de processus (1 = séquentiel)
+    """
+
+    def __init__(
+        self,
+        n_paths: int = 100_000,
+        horizon: int = 252,
+        seed: int | None = None,
+        max_memory_mb: float = 256,
+        n_jobs: int = 1
+    ) -> None:
+        if n_paths < 1 or horizon < 1:
+            raise ValueError("n_paths et horizon doivent être positifs")
+        if n_jobs < 1:
+            raise ValueError("n_jobs doit être supérieur ou égal à 1")
+        self.n_paths = n_paths
+        self.horizon = horizon
+        self.seed = seed
+        self.max_memory_mb = max_memory_mb
+        self.n_jobs = n_jobs
+
+    def __repr__(self) -> str:
+        return f"MonteCarloEngine(n_paths={self.n_paths}, horizon={self.horizon}, seed={self.seed})"
+
+    def _run(self, func: Callable, floats_per_step: int, terminal_only: bool, *args) -> np.ndarray:
+        """
+        Découpe les trajectoires en blocs et concatène les résultats.
+
+        Args:
+            floats_per_step: Nombre de float64 alloués par `func` pour un pas
+                de temps d'une trajectoire, intermédiaires compris
+        """
+        bytes_per_path = 8 * (self.horizon + 1) * floats_per_step
+        chunk = max(1, int(self.max_memory_mb * 1024**2 // bytes_per_path))
+        sizes = [min(chunk, self.n_paths - start) for start in range(0, self.n_paths, chunk)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        common = [self.horizon, terminal_only, *args]
+
+        if self.n_jobs == 1:
+            results = [func(size, seed, *common) for size, seed in zip(sizes, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                futures = [pool.submit(func, size, seed, *common) for size, seed in zip(sizes, seeds)]
+                results = [f.result() for f in futures]
+        return np.concatenate(results)
+
+    def simulate(
+        self,
+        series: PriceSeries,
+        method: str = "gbm",
+        block_size: int = 20,
+        terminal_only: bool = False
+    ) -> np.ndarray:
+        """
+        Simule des trajectoires à partir d'une PriceSeries.
+
+        Méthodes de calibration :
+        - 'gbm' : log-rendements gaussiens IID de drift
+          get_annualized_return() / 252 et de vol get_annualized_volatility() / √252
+        - 'bootstrap' : tirage de blocs consécutifs de log-rendements historiques,
+          ce qui préserve une partie de l'autocorrélation (clustering de vol)
+
+        Args:
+            series: Série de prix historique (le dernier prix est le point de départ)
+            method: 'gbm' ou 'bootstrap'
+            block_size: Longueur des blocs pour le bootstrap
+            terminal_only: Si True, ne renvoie que les prix à l'horizon
+
+        Returns:
+            Tableau (n_paths, horizon + 1), ou (n_paths,) si terminal_only
+        """
+        s0 = series.values[-1]
+        if method == "gbm":
+            periods = series.TRADING_DAYS_PER_YEAR
+            mu = series.get_annualized_return() / periods
+            sigma = series.get_annualized_volatility() / math.sqrt(periods)
+            # Tirages, cumul et prix
+            return self._run(_gbm_chunk, 3, terminal_only, s0, mu, sigma)
+
+        if method == "bootstrap":
+            history = np.diff(np.log(np.asarray(series.values, dtype=float)))
+            if not 1 <= block_size <= len(history):
+                raise ValueError(
+                    f"block_size doit être compris entre 1 et {len(history)}"
+                )
+            # Indices tirés, rendements rééchantillonnés et prix
+            return self._run(_bootstrap_chunk, 3, terminal_only, s0, history, block_size)
+
+        raise ValueError(f"Méthode inconnue: {method!r} (attendu 'gbm' ou 'bootstrap')")
+
+    def simulate_universe(
+        self,
+        assets: Iterable,
+        covariance: FactorCovariance | None = None,
+        terminal_only: bool = False
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Simule des trajectoires corrélées pour tous les actifs d'un univers.
+
+        Avec une FactorCovariance (voir `ledoit_wolf`, `pca_factor_model`),
+        les chocs sont générés sous forme factorisée en O(N·k) par pas ;
+        sinon la covariance échantillonnale est factorisée par Cholesky.
+
+        Args:
+            assets: Itérable d'Asset (une Universe convient)
+            covariance: Covariance par période des log-rendements (optionnelle)
+            terminal_only: Si True, ne renvoie que les prix à l'horizon
+
+        Returns:
+            tuple: (tickers, paths)
+            - paths: Tableau (n_paths, horizon + 1, N), ou (n_paths, N) si terminal_only
+
+        Raises:
+            ValueError: Si la covariance échantillonnale n'est pas définie positive
+        """
+        assets = list(assets)
+        tickers, returns = log_returns_panel(assets)
+        s0 = np.array([a.prices.values[-1] for a in assets], dtype=float)
+        mean = returns.mean(axis=0)
+
+        if covariance is not None:
+            if covariance.tickers != tickers:
+                raise ValueError("La covariance ne correspond pas aux actifs fournis")
+            loadings, specific_sd = covariance.loadings, np.sqrt(covariance.specific)
+        else:
+            try:
+                loadings = np.linalg.cholesky(np.atleast_2d(np.cov(returns, rowvar=False)))
+            except np.linalg.LinAlgError:
+                raise ValueError(
+                    "Covariance échantillonnale non définie positive "
+                    "(N proche de T ?). Fournir une FactorCovariance."
+                ) from None
+            specific_sd = None
+
+        # Par pas : k tirages de facteurs, puis rendements, bruit spécifique
+        # et prix sur N actifs (k = T avec ledoit_wolf)
+        n, k = loadings.shape
+        return tickers, self._run(
+            _multi_chunk, k + 3 * n, terminal_only, s0, mean, loadings, specific_sd
+        )
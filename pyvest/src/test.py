@@ -0,0 +1,663 @@
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyvest.src.asset import Asset
+from pyvest.src.clustering import condensed_distance, correlation_to_distance
+from pyvest.src.correlation import CorrelationAccumulator, MemmapCorrelation
+from pyvest.src.covariance import ledoit_wolf, pca_factor_model
+from pyvest.src.loader import DataLoader
+from pyvest.src.priceseries import PriceSeries
+from pyvest.src.resample import CRYPTO, JPX, japanese_holidays, resample_panel, resample_series
+from pyvest.src.returns import log_returns_panel
+from pyvest.src.risk import rolling_var_cvar, var_cvar
+from pyvest.src.simulation import MonteCarloEngine
+from pyvest.src.universe import Universe, build_correlation_matrix, extract_upper_triangle
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Import du CLI + run entièrement servi par le cache, chronométrés dans
+# un interpréteur neuf pour ne pas bénéficier des modules déjà chargés
+CACHE_ONLY_RUN = """
+import sys, time
+t0 = time.perf_counter()
+from pyvest.src.cli import main
+code = main(["AAPL", "--start", "2024-01-02", "--end", "2024-01-10",
+             "--cache-dir", sys.argv[1], "-o", sys.argv[2]])
+elapsed = time.perf_counter() - t0
+heavy = [m for m in ("pandas", "yfinance", "scipy") if m in sys.modules]
+print(code, elapsed, ",".join(heavy))
+"""
+
+
+def _write_cache(cache_dir: Path) -> None:
+    loader = DataLoader(cache_dir=str(cache_dir))
+    dates = ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05",
+             "2024-01-08", "2024-01-09", "2024-01-10"]
+    prices = [185.6, 184.3, 181.9, 181.2, 185.6, 185.1, 186.2]
+    path = loader._get_cache_path("AAPL", "Close", ("2024-01-02", "2024-01-10"))
+    loader._save_to_cache(path, prices, dates, "AAPL", "Close", "2024-01-02", "2024-01-10")
+
+
+def test_package_import_is_lazy():
+    out = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, pyvest.src; print(any(m in sys.modules for m in ('pandas', 'yfinance', 'scipy')))"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_cache_only_run_starts_fast(tmp_path):
+    _write_cache(tmp_path / "cache")
+    report = tmp_path / "report.csv"
+
+    out = subprocess.run(
+        [sys.executable, "-c", CACHE_ONLY_RUN, str(tmp_path / "cache"), str(report)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    code, elapsed, heavy = out.stdout.split(" ")
+
+    assert code == "0"
+    assert heavy.strip() == ""
+    assert float(elapsed) < 1.0
+    assert report.read_text().splitlines()[1].startswith("AAPL,7,186.2,")
+
+
+class CountingLoader(DataLoader):
+    """DataLoader hors-ligne qui journalise chaque téléchargement dans un fichier."""
+
+    def __init__(self, cache_dir: str, log_path: str) -> None:
+        super().__init__(cache_dir)
+        self.log_path = log_path
+
+    def _download(self, ticker, price_col, start, end):
+        with open(self.log_path, "a") as f:
+            f.write(f"{ticker}\n")
+        # Fetch lent pour élargir la fenêtre de concurrence
+        time.sleep(0.2)
+        index = pd.bdate_range(start, end)
+        return pd.DataFrame({price_col: [float(d.toordinal() % 1000) for d in index]}, index=index)
+
+
+def _hammer(cache_dir: str, log_path: str, ticker: str, dates: tuple[str, str]) -> list[float]:
+    return CountingLoader(cache_dir, log_path).fetch_single_ticker(ticker, "Close", dates).values
+
+
+def test_shared_cache_under_concurrent_processes(tmp_path):
+    cache_dir, log_path = str(tmp_path / "cache"), str(tmp_path / "downloads.log")
+    tickers = ["AAPL", "MSFT", "GOOG"]
+    first, extended = ("2024-01-01", "2024-03-31"), ("2024-01-01", "2024-06-30")
+    expected = {
+        d: [float(x.toordinal() % 1000) for x in pd.bdate_range(*d)]
+        for d in (first, extended)
+    }
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=8, mp_context=ctx) as pool:
+        # Vague 1 : défauts de cache concurrents sur les mêmes tickers
+        jobs = [(t, first) for t in tickers for _ in range(8)]
+        # Vague 2 : extensions concurrentes mêlées à des lectures
+        jobs2 = [(t, d) for t in tickers for d in (first, extended) for _ in range(8)]
+        for wave in (jobs, jobs2):
+            futures = [pool.submit(_hammer, cache_dir, log_path, t, d) for t, d in wave]
+            for (t, d), future in zip(wave, futures):
+                assert future.result() == expected[d]
+
+    downloads = Path(log_path).read_text().split()
+    # Un fetch initial et un fetch complémentaire par ticker, jamais plus
+    assert sorted(downloads) == sorted(tickers * 2)
+    files = sorted(p.name for p in Path(cache_dir).iterdir() if p.suffix in (".pkl", ".tmp"))
+    assert files == [f"{t}_Close_2024-01-01_2024-06-30.pkl" for t in sorted(tickers)]
+
+
+class FailingGapLoader(DataLoader):
+    """DataLoader hors-ligne dont le téléchargement échoue tant que `online` est faux."""
+
+    online = False
+
+    def _download(self, ticker, price_col, start, end):
+        if not self.online:
+            return None
+        index = pd.bdate_range(start, end)
+        return pd.DataFrame({price_col: [float(d.toordinal() % 1000) for d in index]}, index=index)
+
+
+def test_failed_gap_download_keeps_cache_entry(tmp_path):
+    _write_cache(tmp_path)
+    loader = FailingGapLoader(cache_dir=str(tmp_path))
+
+    series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-31"))
+    # Seule la partie en cache est servie, l'entrée garde son nom d'origine
+    assert len(series) == 7
+    assert [p.name for p in tmp_path.glob("*.pkl")] == ["AAPL_Close_2024-01-02_2024-01-10.pkl"]
+
+    # Une fois le réseau revenu, la même requête retélécharge la partie manquante
+    loader.online = True
+    series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-31"))
+    assert len(series) == 7 + len(pd.bdate_range("2024-01-11", "2024-01-31"))
+    assert [p.name for p in tmp_path.glob("*.pkl")] == ["AAPL_Close_2024-01-02_2024-01-31.pkl"]
+
+    # Un défaut de cache en échec ne crée aucune entrée
+    loader.online = False
+    assert loader.fetch_single_ticker("MSFT", "Close", ("2024-01-02", "2024-01-31")) is None
+    assert not list(tmp_path.glob("MSFT_*.pkl"))
+
+
+def _metrics_worker(cache_dir: str, risk_free_rate: float) -> float:
+    loader = DataLoader(cache_dir)
+    series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-10"))
+    return loader.get_metrics("AAPL", "Close", series, risk_free_rate)["sharpe_ratio"]
+
+
+def test_concurrent_get_metrics_keeps_every_entry(tmp_path):
+    _write_cache(tmp_path)
+    rates = [0.01 * k for k in range(16)]
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=8, mp_context=ctx) as pool:
+        list(pool.map(_metrics_worker, [str(tmp_path)] * len(rates), rates))
+
+    with open(DataLoader(str(tmp_path))._get_metrics_path("AAPL", "Close"), "rb") as f:
+        assert len(pickle.load(f)) == len(rates)
+
+
+class EmptyGapLoader(DataLoader):
+    """DataLoader hors-ligne qui compte les téléchargements et ne renvoie aucune ligne."""
+
+    downloads = 0
+
+    def _download(self, ticker, price_col, start, end):
+        self.downloads += 1
+        return self._empty_frame(price_col)
+
+
+def test_empty_past_gap_extends_cache_entry(tmp_path):
+    _write_cache(tmp_path)
+    loader = EmptyGapLoader(cache_dir=str(tmp_path))
+
+    # Le cache s'arrête le mercredi 10, la requête le dimanche 14 sans cotation
+    for _ in range(2):
+        series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-14"))
+        assert len(series) == 7
+    assert loader.downloads == 1
+    assert [p.name for p in tmp_path.glob("*.pkl")] == ["AAPL_Close_2024-01-02_2024-01-14.pkl"]
+
+    # Une période vide qui n'est pas encore passée ne prolonge pas l'entrée
+    future = (pd.Timestamp.today() + pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+    loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", future))
+    assert [p.name for p in tmp_path.glob("*.pkl")] == ["AAPL_Close_2024-01-02_2024-01-14.pkl"]
+
+
+def test_metrics_store_hit_and_invalidation(tmp_path, monkeypatch):
+    import pyvest.src.loader as loader_module
+
+    calls = []
+    compute = loader_module.compute_metrics
+    monkeypatch.setattr(
+        loader_module, "compute_metrics",
+        lambda series, rf=0.0: calls.append(series.name) or compute(series, rf),
+    )
+    _write_cache(tmp_path)
+    loader = FailingGapLoader(cache_dir=str(tmp_path))
+    loader.online = True
+    metrics_path = loader._get_metrics_path("AAPL", "Close")
+
+    series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-10"))
+    first = loader.get_metrics("AAPL", "Close", series)
+    # Deuxième appel servi par le fichier .metrics, sans recalcul
+    assert loader.get_metrics("AAPL", "Close", series) == first
+    assert calls == ["AAPL"] and metrics_path.exists()
+
+    # Étendre l'entrée de cache supprime les métriques stockées
+    extended = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-31"))
+    assert not metrics_path.exists()
+    assert loader.get_metrics("AAPL", "Close", series) == first
+    assert loader.get_metrics("AAPL", "Close", extended)["n_prices"] == len(extended)
+    assert calls == ["AAPL"] * 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="verrous supprimables sous POSIX seulement")
+def test_clear_cache_removes_orphans_and_free_locks(tmp_path):
+    loader = FailingGapLoader(cache_dir=str(tmp_path))
+    loader.online = True
+    series = loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-10"))
+    loader.get_metrics("AAPL", "Close", series)
+    stale = tmp_path / ".AAPL_Close.metrics.abcd.tmp"
+    stale.write_bytes(b"")
+    os.utime(stale, (time.time() - 3600,) * 2)
+    fresh = tmp_path / ".AAPL_Close.metrics.efgh.tmp"
+    fresh.write_bytes(b"")
+
+    with loader._cache_lock("MSFT", "Close"):
+        # .pkl, .metrics, .tmp orphelin et verrou libre d'AAPL
+        assert loader.clear_cache() == 4
+        assert sorted(p.name for p in tmp_path.iterdir()) == [fresh.name, "MSFT_Close.lock"]
+
+    assert loader.clear_cache(tmp_max_age=0) == 2
+    assert not list(tmp_path.iterdir())
+    # Le verrou est recréé au besoin
+    assert loader.fetch_single_ticker("AAPL", "Close", ("2024-01-02", "2024-01-10")).values == series.values
+
+
+def _random_assets(n: int = 12, t: int = 80, seed: int = 0) -> list[Asset]:
+    """Actifs synthétiques exposés à deux facteurs communs."""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (t, 2))
+    loadings = rng.normal(1, 0.5, (n, 2))
+    returns = factors @ loadings.T + rng.normal(0, 0.01, (t, n))
+    prices = 100 * np.exp(np.vstack([np.zeros(n), np.cumsum(returns, axis=0)]))
+    return [Asset(f"A{i}", PriceSeries(prices[:, i].tolist(), f"A{i}")) for i in range(n)]
+
+
+def test_log_returns_panel_aligns_on_dates_or_latest_observations():
+    days = list(pd.bdate_range("2024-01-01", periods=12).date)
+    a = [100.0 * 1.01 ** k for k in range(12)]
+    b = [50.0 + k * k for k in range(12)]
+    # B commence 3 séances plus tard et saute la 8e séance
+    kept = [k for k in range(3, 12) if k != 7]
+    dated = [
+        Asset("A", PriceSeries(a, "A", dates=days)),
+        Asset("B", PriceSeries([b[k] for k in kept], "B", dates=[days[k] for k in kept])),
+    ]
+    _, r = log_returns_panel(dated)
+    expected = np.diff(np.log(np.column_stack([np.array(a)[kept], np.array(b)[kept]])), axis=0)
+    assert np.allclose(r, expected)
+
+    # Sans dates : les observations les plus récentes de chaque série
+    undated = [Asset("A", PriceSeries(a, "A")), Asset("B", PriceSeries(b[3:], "B"))]
+    _, r = log_returns_panel(undated)
+    assert np.allclose(r, np.diff(np.log(np.column_stack([a[3:], b[3:]])), axis=0))
+
+
+def test_ledoit_wolf_matches_dense_formula():
+    # N > T et N < T : les deux branches de la matrice de Gram
+    for n, t in [(12, 80), (30, 20)]:
+        assets = _random_assets(n, t)
+        _, r = log_returns_panel(assets)
+        x = r - r.mean(axis=0)
+        s = x.T @ x / t
+        mu = np.trace(s) / n
+        d2 = np.sum((s - mu * np.eye(n)) ** 2) / n
+        b2 = sum(np.sum((np.outer(row, row) - s) ** 2) for row in x) / t**2 / n
+        delta = min(b2, d2) / d2
+        sigma = delta * mu * np.eye(n) + (1 - delta) * s
+
+        cov, shrinkage = ledoit_wolf(assets)
+        assert np.isclose(shrinkage, delta)
+        assert np.allclose(cov.to_dataframe().values, sigma)
+        w = np.linspace(1, 2, n) / np.linspace(1, 2, n).sum()
+        assert np.isclose(cov.portfolio_variance(w), w @ sigma @ w)
+
+
+def test_pca_factor_model_rows_match_dense_matrix():
+    assets = _random_assets()
+    cov = pca_factor_model(assets, n_factors=2)
+    dense = cov.to_dataframe()
+    assert cov.loadings.shape == (12, 2)
+
+    std = np.sqrt(np.diag(dense.values))
+    corr = dense.values / np.outer(std, std)
+    assert np.allclose(cov.correlation_row("a3").values, corr[3])
+    assert np.isclose(cov.correlation("A1", "A2"), corr[1, 2])
+    # Les variances totales sont celles de l'échantillon
+    _, r = log_returns_panel(assets)
+    assert np.allclose(cov.variances, r.var(axis=0, ddof=1))
+
+
+def test_condensed_distance_matches_pdist():
+    from scipy.spatial.distance import pdist
+
+    assets = _random_assets(n=13)
+    _, r = log_returns_panel(assets)
+    expected = np.sqrt(0.5 * pdist(r.T, "correlation"))
+
+    # block_size ne divise pas N : les offsets du format condensé changent de bloc
+    tickers, distances = condensed_distance(assets, block_size=5)
+    assert tickers == [a.ticker for a in assets]
+    assert np.allclose(distances, expected)
+    assert np.allclose(correlation_to_distance(np.corrcoef(r.T)), expected)
+
+
+def test_universe_cluster_round_trip():
+    universe = Universe(_random_assets(n=10))
+    labels = universe.cluster(n_clusters=3)
+
+    assert set(labels) == set(universe.tickers)
+    assert universe.clusters == labels
+    for label in set(labels.values()):
+        members = universe.filter_by_cluster(label)
+        assert members
+        assert all(labels[a.ticker] == label for a in members)
+    assert sum(len(universe.filter_by_cluster(l)) for l in set(labels.values())) == 10
+
+    universe.remove("A0")
+    assert "A0" not in universe.clusters
+
+
+def test_append_prices_updates_tracked_correlations():
+    full = _random_assets(n=6, t=60)
+    history = [Asset(a.ticker, PriceSeries(a.prices.values[:41], a.ticker)) for a in full]
+    universe = Universe(history)
+    universe.track_correlations()
+
+    for k in range(41, 61):
+        universe.append_prices({a.ticker: a.prices.values[k] for a in full})
+
+    _, r = log_returns_panel(full)
+    assert np.allclose(universe.correlation_matrix().values, np.corrcoef(r.T))
+
+
+def test_track_correlations_with_unequal_history_lengths():
+    full = _random_assets(n=2, t=120, seed=5)
+    # A a 100 prix, B seulement 60, se terminant à la même date
+    history = [
+        Asset("A0", PriceSeries(full[0].prices.values[:100], "A0")),
+        Asset("A1", PriceSeries(full[1].prices.values[40:100], "A1")),
+    ]
+    universe = Universe(history)
+    universe.track_correlations(window=30)
+    for k in range(100, 121):
+        universe.append_prices({a.ticker: a.prices.values[k] for a in full})
+
+    _, r = log_returns_panel(full)
+    assert np.allclose(universe.correlation_matrix().values, np.corrcoef(r[-30:].T))
+
+    days = list(pd.bdate_range("2024-01-01", periods=10).date)
+    dated = Universe([
+        Asset("A", PriceSeries([float(k + 1) for k in range(10)], "A", dates=days)),
+        Asset("B", PriceSeries([float(k + 2) for k in range(9)], "B", dates=days[:9])),
+    ])
+    with pytest.raises(ValueError):
+        dated.track_correlations()
+
+
+def test_accumulator_window_and_decay_modes():
+    assets = _random_assets(n=5, t=70)
+    tickers, r = log_returns_panel(assets)
+
+    window = CorrelationAccumulator.from_assets(assets, window=20)
+    assert np.allclose(window.correlation_matrix().values, np.corrcoef(r[-20:].T))
+
+    # Même résultat en ajoutant les rendements un par un
+    decay = CorrelationAccumulator(tickers, decay=0.95)
+    for row in r:
+        decay.update(row)
+    weights = 0.95 ** np.arange(len(r) - 1, -1, -1)
+    mean = weights @ r / weights.sum()
+    expected = ((r - mean) * weights[:, None]).T @ (r - mean) / weights.sum()
+    assert np.allclose(decay.covariance(), expected)
+    batched = CorrelationAccumulator.from_assets(assets, decay=0.95)
+    assert np.allclose(batched.covariance(), expected)
+
+
+def test_add_or_remove_resets_correlation_tracking():
+    assets = _random_assets(n=4)
+    universe = Universe(assets[:3])
+    universe.track_correlations()
+
+    universe.remove("A2")
+    with pytest.raises(ValueError):
+        universe.correlation_matrix()
+    universe.append_prices({"A0": 101.0, "A1": 99.0})
+
+    universe.track_correlations()
+    universe.add(assets[3])
+    with pytest.raises(ValueError):
+        universe.correlation_matrix()
+
+
+def test_append_prices_extends_dates_for_resampling():
+    dates = list(pd.bdate_range("2024-01-01", "2024-01-11").date)
+    universe = Universe([Asset("AAA", PriceSeries([100.0 + k for k in range(len(dates))], "AAA", dates=dates))])
+
+    with pytest.raises(ValueError):
+        universe.append_prices({"AAA": 120.0})
+    universe.append_prices({"AAA": 120.0}, date=pd.Timestamp("2024-01-12").date())
+
+    assert resample_series(universe.get("AAA").prices, "W").values == [104.0, 120.0]
+    weekly = universe.resample("W").get("AAA").prices
+    assert weekly.values == [104.0, 120.0]
+    assert str(weekly.dates[-1]) == "2024-01-12"
+
+
+def test_resample_keeps_crypto_weekend_bars():
+    days = pd.date_range("2024-01-01", "2024-01-14")
+    btc = Asset("BTC", PriceSeries([float(k) for k in range(len(days))], "BTC", dates=list(days.date)),
+                calendar=CRYPTO)
+    weekdays = days[days.dayofweek < 5]
+    spy = Asset("SPY", PriceSeries([100.0 + k for k in range(len(weekdays))], "SPY", dates=list(weekdays.date)))
+    universe = Universe([btc, spy])
+
+    daily = universe.resample("D")
+    assert daily.get("BTC").prices.values == btc.prices.values
+    assert daily.get("BTC").prices.TRADING_DAYS_PER_YEAR == 365
+    assert daily.get("SPY").prices.values == spy.prices.values
+    assert daily.get("SPY").prices.TRADING_DAYS_PER_YEAR == 252
+
+    weekly = universe.resample("W")
+    # Clôture du dimanche pour la crypto, du vendredi pour l'action
+    assert weekly.get("BTC").prices.values == [6.0, 13.0]
+    assert weekly.get("SPY").prices.values == [104.0, 109.0]
+
+
+def test_japanese_holidays_follow_their_years():
+    closed = [str(d) for d in japanese_holidays([2010]) if np.is_busday(d)]
+    assert closed == [
+        "2010-01-01", "2010-01-11", "2010-02-11", "2010-03-22", "2010-04-29",
+        "2010-05-03", "2010-05-04", "2010-05-05", "2010-07-19", "2010-09-20",
+        "2010-09-23", "2010-10-11", "2010-11-03", "2010-11-23", "2010-12-23",
+        "2010-12-31",
+    ]
+    # Pas de report pour les fermetures de la bourse, fêtes selon leur année
+    assert JPX.is_session(["2010-01-04", "2010-02-23", "2010-08-11", "2019-12-23"]).all()
+    assert not JPX.is_session(["2018-12-24", "2019-04-30", "2020-02-24", "2021-08-09"]).any()
+
+
+def test_resample_without_sessions_raises_value_error():
+    with pytest.raises(ValueError):
+        resample_panel([], np.empty((0, 3)), "W")
+    weekend = PriceSeries([1.0, 2.0], "X", dates=["2024-01-06", "2024-01-07"])
+    with pytest.raises(ValueError):
+        resample_series(weekend, "W")
+
+
+def test_memmap_correlation_matches_dense_matrix(tmp_path):
+    assets = _random_assets(n=11)
+    dense = build_correlation_matrix(assets)
+    path = tmp_path / "corr.bin"
+
+    # block_size ne divise pas N : tuiles de bord incomplètes
+    Universe(assets).write_correlation_memmap(str(path), dtype="float64", block_size=4)
+    stored = MemmapCorrelation(path)
+
+    assert stored.tickers == list(dense.index)
+    assert np.allclose(np.asarray(stored.matrix), dense.values)
+    assert np.allclose(stored.row("a5").values, dense.loc["A5"].values)
+    assert np.isclose(stored.get("A1", "A7"), dense.loc["A1", "A7"])
+
+    pairs = stored.upper_triangle(block_size=3)
+    expected = extract_upper_triangle(dense)
+    assert len(pairs) == 11 * 10 // 2
+    assert np.allclose(pairs["correlation"].values, expected["correlation"].values)
+    assert set(zip(pairs["asset_1"], pairs["asset_2"])) == set(zip(expected["asset_1"], expected["asset_2"]))
+
+    strong = stored.upper_triangle(min_correlation=0.5)
+    assert (strong["correlation"] >= 0.5).all()
+    assert len(strong) == (expected["correlation"] >= 0.5).sum()
+
+    f32 = MemmapCorrelation.build(assets, tmp_path / "corr32.bin", dtype="float32", block_size=4)
+    assert np.allclose(np.asarray(f32.matrix), dense.values, atol=1e-6)
+
+
+def test_monte_carlo_is_reproducible_across_processes():
+    series = _random_assets(n=1, t=120)[0].prices
+    # ~0.05 Mo par bloc : plusieurs blocs, donc plusieurs graines
+    kwargs = dict(n_paths=2000, horizon=30, seed=42, max_memory_mb=0.05)
+
+    sequential = MonteCarloEngine(n_jobs=1, **kwargs)
+    parallel = MonteCarloEngine(n_jobs=2, **kwargs)
+    for method in ("gbm", "bootstrap"):
+        paths = sequential.simulate(series, method=method, block_size=5)
+        assert paths.shape == (2000, 31)
+        assert np.array_equal(paths, parallel.simulate(series, method=method, block_size=5))
+        assert np.allclose(paths[:, 0], series.values[-1])
+
+    terminal = sequential.simulate(series, terminal_only=True)
+    assert terminal.shape == (2000,)
+    assert np.array_equal(terminal, parallel.simulate(series, terminal_only=True))
+
+
+def test_monte_carlo_universe_shapes():
+    assets = _random_assets(n=4, t=100)
+    engine = MonteCarloEngine(n_paths=500, horizon=10, seed=1, max_memory_mb=0.05)
+
+    tickers, paths = engine.simulate_universe(assets)
+    assert tickers == [a.ticker for a in assets]
+    assert paths.shape == (500, 11, 4)
+    assert np.allclose(paths[:, 0], [a.prices.values[-1] for a in assets])
+
+    cov, _ = ledoit_wolf(assets)
+    _, terminal = engine.simulate_universe(assets, covariance=cov, terminal_only=True)
+    assert terminal.shape == (500, 4)
+
+
+def test_monte_carlo_factor_chunks_respect_memory_budget():
+    # Ledoit-Wolf : k = T facteurs, bien plus que N actifs
+    assets = _random_assets(n=3, t=1500)
+    cov, _ = ledoit_wolf(assets)
+    engine = MonteCarloEngine(n_paths=500, horizon=252, seed=0, max_memory_mb=8)
+
+    tracemalloc.start()
+    try:
+        _, terminal = engine.simulate_universe(assets, covariance=cov, terminal_only=True)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert terminal.shape == (500, 3)
+    assert peak < 12 * 1024**2
+
+
+def test_historical_var_cvar_matches_full_sort():
+    # T = 500 : 0.05 × T tombe pile sur un entier (piège de l'arrondi flottant)
+    assets = _random_assets(n=4, t=500)
+    _, r = log_returns_panel(assets)
+    result = var_cvar(assets, confidence=(0.95, 0.99), weights={"a0": 0.5, "A1": 0.5})
+
+    basket = r[:, :2] @ [0.5, 0.5]
+    for j, ticker in enumerate(["A0", "A1", "A2", "A3", "PORTFOLIO"]):
+        x = np.sort(r[:, j] if j < 4 else basket)
+        for c, k in ((95, 25), (99, 5)):
+            assert np.isclose(result.loc[ticker, f"var_{c}"], -x[k - 1])
+            assert np.isclose(result.loc[ticker, f"cvar_{c}"], -x[:k].mean())
+
+
+def test_cornish_fisher_cvar_matches_numerical_integration():
+    from scipy.stats import norm
+
+    assets = _random_assets(n=2, t=400, seed=3)
+    _, r = log_returns_panel(assets)
+    result = var_cvar(assets, confidence=(0.99,), method="cornish_fisher")
+
+    x = r[:, 0]
+    mean, std = x.mean(), x.std(ddof=1)
+    z = (x - mean) / std
+    skew, kurt = np.mean(z**3), np.mean(z**4) - 3
+    u = (np.arange(200_000) + 0.5) / 200_000 * 0.01
+    q = norm.ppf(u)
+    q_cf = q + (q**2 - 1) * skew / 6 + (q**3 - 3 * q) * kurt / 24 - (2 * q**3 - 5 * q) * skew**2 / 36
+    assert np.isclose(result.loc["A0", "cvar_99"], -(mean + q_cf.mean() * std), rtol=1e-4)
+
+
+def test_rolling_var_cvar_last_window_matches_static():
+    assets = _random_assets(n=3, t=150)
+    for method in ("historical", "parametric", "cornish_fisher"):
+        var, cvar = rolling_var_cvar(assets, window=60, confidence=0.95, method=method, chunk_size=7)
+        assert var.shape == (91, 3)
+
+        last = [Asset(a.ticker, PriceSeries(a.prices.values[-61:], a.ticker)) for a in assets]
+        static = var_cvar(last, confidence=(0.95,), method=method)
+        assert np.allclose(var.iloc[-1].values, static["var_95"].values)
+        assert np.allclose(cvar.iloc[-1].values, static["cvar_95"].values)
+
+
+def test_universe_regress_against_lstsq():
+    assets = _random_assets(n=6, t=120, seed=3)
+    universe, benchmarks = Universe(assets[:4]), assets[4:]
+    _, r = log_returns_panel(assets)
+    y, x = r[:, :4], np.column_stack([np.ones(len(r)), r[:, 4:]])
+
+    coefs, _, _, _ = np.linalg.lstsq(x, y, rcond=None)
+    residuals = y - x @ coefs
+    result = universe.regress(benchmarks)
+    assert np.allclose(result["alpha"], coefs[0] * 252)
+    assert np.allclose(result[["beta_A4", "beta_A5"]].values, coefs[1:].T)
+    assert np.allclose(result["r2"], 1 - residuals.var(axis=0) / y.var(axis=0))
+    assert np.allclose(result["residual_vol"], residuals.std(axis=0, ddof=3) * np.sqrt(252))
+
+    # Annualisation déduite des séries, ex: données hebdomadaires
+    weekly = [Asset(a.ticker, PriceSeries(a.prices.values, a.ticker, periods_per_year=52)) for a in assets]
+    weekly_result = Universe(weekly[:4]).regress(weekly[4:])
+    assert np.allclose(weekly_result["alpha"], coefs[0] * 52)
+    with pytest.raises(ValueError):
+        Universe(weekly[:4]).regress(benchmarks)
+
+
+def test_universe_rolling_regress_last_window_against_lstsq():
+    assets = _random_assets(n=5, t=90, seed=4)
+    universe, benchmarks = Universe(assets[:3]), assets[3:]
+    _, r = log_returns_panel(assets)
+    window = 30
+
+    rolling = universe.rolling_regress(benchmarks, window)
+    assert len(rolling["alpha"]) == len(r) - window + 1
+
+    y, f = r[-window:, :3], r[-window:, 3:]
+    coefs, _, _, _ = np.linalg.lstsq(np.column_stack([np.ones(window), f]), y, rcond=None)
+    assert np.allclose(rolling["alpha"].iloc[-1], coefs[0] * 252)
+    assert np.allclose(rolling["beta_A3"].iloc[-1], coefs[1])
+    assert np.allclose(rolling["beta_A4"].iloc[-1], coefs[2])
+
+
+def test_regress_aligns_dated_series_of_unequal_length():
+    days = list(pd.bdate_range("2024-01-01", periods=60).date)
+    rng = np.random.default_rng(6)
+    spy = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+    # 2 × SPY, coté 5 séances plus tard et sans la 30e séance
+    kept = [k for k in range(5, 60) if k != 29]
+    asset = Asset("X", PriceSeries([2 * spy[k] for k in kept], "X", dates=[days[k] for k in kept]))
+    benchmark = Asset("SPY", PriceSeries(spy.tolist(), "SPY", dates=days))
+
+    result = Universe([asset]).regress([benchmark])
+    assert np.isclose(result.loc["X", "beta_SPY"], 1.0)
+    assert np.isclose(result.loc["X", "r2"], 1.0)
+
+
+def test_rolling_regress_singular_windows_are_nan():
+    rng = np.random.default_rng(7)
+    # Prix du benchmark figés des positions 29 à 69 (40 rendements nuls)
+    returns = rng.normal(0, 0.01, 100)
+    returns[30:70] = 0.0
+    spy = 100 * np.exp(np.cumsum(returns))
+    asset = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))
+    universe = Universe([Asset("X", PriceSeries(asset.tolist(), "X"))])
+    benchmark = Asset("SPY", PriceSeries(spy.tolist(), "SPY"))
+
+    beta = universe.rolling_regress([benchmark], window=10)["beta_SPY"]["X"]
+    # Fenêtres de rendements entièrement dans la période de prix plats
+    flat = (beta.index >= 38) & (beta.index <= 68)
+    assert beta[flat].isna().all()
+    assert beta[~flat].notna().all()
+
+    _, r = log_returns_panel([universe.get("X"), benchmark])
+    coefs, _, _, _ = np.linalg.lstsq(np.column_stack([np.ones(10), r[-10:, 1]]), r[-10:, 0], rcond=None)
+    assert np.isclose(beta.iloc[-1], coefs[1])
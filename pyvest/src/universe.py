@@ -1,6 +1,15 @@
-from pyvest.core.asset import Asset
+from itertools import combinations
 from typing import Iterator
 
+import numpy as np
+import pandas as pd
+
+from .asset import Asset
+from .correlation import CorrelationAccumulator, MemmapCorrelation
+from .priceseries import PriceSeries
+from .regression import regress, rolling_regress
+from .resample import periods_per_year, resample_assets
+
 
 class Universe:
     """
@@ -17,14 +26,22 @@ class Universe:
     """
     
     def __init__(self, assets: list[Asset] | None = None) -> None:
-        self._assets: dict[str, Asset] = {}. 'tu crées le dictionnaire'
+        self._assets: dict[str, Asset] = {}  # tu crées le dictionnaire
+        self._clusters: dict[str, int] = {}
+        self._correlations: CorrelationAccumulator | None = None
         if assets:
             for asset in assets:
                 self.add(asset)
     
     def add(self, asset: Asset) -> None:
-        """Ajoute un actif à l'univers."""
+        """
+        Ajoute un actif à l'univers.
+
+        Le suivi des corrélations (`track_correlations`) est réinitialisé :
+        il ne couvre plus l'ensemble des actifs.
+        """
         self._assets[asset.ticker.upper()] = asset
+        self._correlations = None
         
     
     def get(self, ticker: str) -> Asset | None:
@@ -33,7 +50,13 @@ class Universe:
         
     
     def remove(self, ticker: str) -> Asset | None:
-        """Retire un actif de l'univers."""
+        """
+        Retire un actif de l'univers.
+
+        Le suivi des corrélations (`track_correlations`) est réinitialisé.
+        """
+        self._clusters.pop(ticker.upper(), None)
+        self._correlations = None
         return self._assets.pop(ticker.upper(), None)
     
     def __len__(self) -> int:
@@ -56,8 +79,217 @@ class Universe:
         """Filtre les actifs par secteur."""
         s = sector.strip().lower()
         return [asset for asset in self._assets.values()if asset.sector is not None and asset.sector.strip().lower() == s]
-  
-from itertools import combinations
+
+    @property
+    def clusters(self) -> dict[str, int]:
+        """Groupe de chaque actif, issu du dernier appel à `cluster`."""
+        return dict(self._clusters)
+
+    def cluster(
+        self,
+        n_clusters: int | None = None,
+        threshold: float | None = None,
+        method: str = "average"
+    ) -> dict[str, int]:
+        """
+        Regroupe les actifs par classification hiérarchique des corrélations.
+
+        Les groupes sont conservés et peuvent ensuite être filtrés avec
+        `filter_by_cluster`, comme les secteurs avec `filter_by_sector`.
+
+        Args:
+            n_clusters: Nombre de groupes souhaité
+            threshold: Distance de corrélation maximale dans un groupe
+            method: Méthode de linkage scipy
+
+        Returns:
+            Dictionnaire {ticker: numéro de groupe}
+        """
+        # Import local : scipy est long à importer et inutile hors clustering
+        from .clustering import hierarchical_clusters
+
+        labels, _ = hierarchical_clusters(self, n_clusters, threshold, method)
+        self._clusters = {t: int(label) for t, label in labels.items()}
+        return self.clusters
+
+    def filter_by_cluster(self, label: int) -> list[Asset]:
+        """Filtre les actifs par groupe de corrélation."""
+        return [asset for ticker, asset in self._assets.items() if self._clusters.get(ticker) == label]
+
+    def track_correlations(
+        self,
+        decay: float | None = None,
+        window: int | None = None
+    ) -> CorrelationAccumulator:
+        """
+        Initialise le suivi incrémental des corrélations sur l'historique actuel.
+
+        Les appels suivants à `append_prices` mettent la matrice à jour
+        en O(N²) au lieu de la recalculer depuis le début. `add` et `remove`
+        annulent le suivi : rappeler alors `track_correlations`.
+
+        L'historique est aligné par `log_returns_panel` (rendements les plus
+        récents, ou dates communes) ; les nouveaux rendements étant ajoutés
+        à la suite, toutes les séries doivent se terminer à la même date.
+
+        Args:
+            decay: Facteur de décroissance exponentielle (optionnel)
+            window: Taille de fenêtre glissante (optionnelle)
+
+        Raises:
+            ValueError: Si les séries datées ne se terminent pas à la même date
+        """
+        last_dates = {
+            str(a.prices.dates[-1])[:10] for a in self if a.prices.dates is not None
+        }
+        if len(last_dates) > 1:
+            raise ValueError(
+                f"Les séries ne se terminent pas à la même date: {', '.join(sorted(last_dates))}"
+            )
+        self._correlations = CorrelationAccumulator.from_assets(self, decay=decay, window=window)
+        return self._correlations
+
+    def append_prices(self, prices: dict[str, float], date=None) -> None:
+        """
+        Ajoute une nouvelle barre de prix pour chaque actif.
+
+        Args:
+            prices: Dictionnaire {ticker: prix}, un prix par actif de l'univers
+            date: Date de la barre, ajoutée aux dates des séries datées
+                (obligatoire si au moins une série est datée)
+
+        Raises:
+            ValueError: Si un actif de l'univers n'a pas de prix, ou si
+                date manque alors qu'une série est datée
+        """
+        new_prices = {t.upper(): p for t, p in prices.items()}
+        missing = [t for t in self._assets if t not in new_prices]
+        if missing:
+            raise ValueError(f"Prix manquants pour: {', '.join(missing)}")
+        dated = [t for t, a in self._assets.items() if a.prices.dates is not None]
+        if dated and date is None:
+            raise ValueError(f"Date manquante pour les séries datées: {', '.join(dated)}")
+
+        if self._correlations is not None:
+            returns = np.array([
+                np.log(new_prices[t] / self._assets[t].prices.values[-1])
+                for t in self._correlations.tickers
+            ])
+            self._correlations.update(returns)
+
+        for ticker, asset in self._assets.items():
+            asset.prices.values.append(new_prices[ticker])
+            if asset.prices.dates is not None:
+                asset.prices.dates.append(date)
+
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Matrice de corrélation suivie par `track_correlations`."""
+        if self._correlations is None:
+            raise ValueError("Appeler track_correlations avant correlation_matrix")
+        return self._correlations.correlation_matrix()
+
+    def write_correlation_memmap(
+        self,
+        path: str,
+        dtype: str = "float32",
+        block_size: int = 1024
+    ) -> MemmapCorrelation:
+        """
+        Calcule la matrice de corrélation par tuiles directement sur disque.
+
+        À utiliser quand `build_correlation_matrix` ne tient pas en mémoire.
+        La matrice peut être rouverte plus tard avec `MemmapCorrelation(path)`.
+        """
+        return MemmapCorrelation.build(self, path, dtype=dtype, block_size=block_size)
+
+    def resample(self, freq: str, how: str = "last") -> "Universe":
+        """
+        Rééchantillonne tous les actifs en une passe (voir `resample_assets`).
+
+        Chaque actif ne garde que les jours de cotation de son calendrier
+        (`Asset.calendar`) et reçoit le facteur d'annualisation de la
+        fréquence, selon ce calendrier en quotidien.
+
+        Args:
+            freq: 'D', 'W', 'M', 'Q' ou 'Y'
+            how: 'last', 'first', 'high', 'low' ou 'mean'
+
+        Returns:
+            Nouvelle Universe (les actifs d'origine ne sont pas modifiés)
+        """
+        period_dates, tickers, values = resample_assets(self, freq, how)
+
+        resampled = Universe()
+        for j, ticker in enumerate(tickers):
+            asset = self._assets[ticker]
+            # Périodes sans observation de cet actif (ex: week-ends d'une action)
+            observed = ~np.isnan(values[:, j])
+            prices = PriceSeries(
+                values[observed, j].tolist(), ticker, dates=period_dates[observed].tolist(),
+                periods_per_year=periods_per_year(freq, asset.calendar)
+            )
+            resampled.add(Asset(
+                ticker, prices, sector=asset.sector, currency=asset.currency, calendar=asset.calendar
+            ))
+        return resampled
+
+    def _periods_per_year(self, benchmarks: list[Asset]) -> float:
+        """
+        Facteur d'annualisation commun aux actifs et aux facteurs.
+
+        Raises:
+            ValueError: Si les séries n'ont pas toutes le même TRADING_DAYS_PER_YEAR
+        """
+        factors = {a.prices.TRADING_DAYS_PER_YEAR for a in [*self, *benchmarks]}
+        if len(factors) != 1:
+            raise ValueError(
+                f"Facteurs d'annualisation différents: {sorted(factors)}. "
+                "Rééchantillonner l'univers ou passer periods_per_year."
+            )
+        return factors.pop()
+
+    def regress(
+        self,
+        benchmarks: list[Asset],
+        periods_per_year: float | None = None
+    ) -> pd.DataFrame:
+        """
+        Alpha, betas, volatilité résiduelle et R² de chaque actif
+        face à un ou plusieurs facteurs, en une seule résolution (voir `regress`).
+
+        Args:
+            benchmarks: Actifs servant de facteurs (ex: SPY)
+            periods_per_year: Facteur d'annualisation ; par défaut celui des
+                séries (ex: 52 après `resample('W')`)
+
+        Returns:
+            DataFrame indexé par ticker
+        """
+        if periods_per_year is None:
+            periods_per_year = self._periods_per_year(benchmarks)
+        return regress(self, benchmarks, periods_per_year)
+
+    def rolling_regress(
+        self,
+        benchmarks: list[Asset],
+        window: int,
+        periods_per_year: float | None = None
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Alpha et betas de chaque actif sur fenêtre glissante (voir `rolling_regress`).
+
+        Args:
+            benchmarks: Actifs servant de facteurs
+            window: Nombre d'observations par fenêtre
+            periods_per_year: Facteur d'annualisation de alpha ; par défaut
+                celui des séries
+
+        Returns:
+            Dictionnaire {'alpha', 'beta_<facteur>', ...} de DataFrames
+        """
+        if periods_per_year is None:
+            periods_per_year = self._periods_per_year(benchmarks)
+        return rolling_regress(self, benchmarks, window, periods_per_year)
 
 
 def top_k_correlations(
@@ -94,10 +326,6 @@ def top_k_correlations(
 
     return correlations[:k]
 
-    import pandas as pd
-import numpy as np
-from itertools import combinations
-
 
 def build_correlation_matrix(assets: list[Asset]) -> pd.DataFrame:
     """
@@ -119,7 +347,19 @@ def build_correlation_matrix(assets: list[Asset]) -> pd.DataFrame:
     ticker_to_idx = {t: i for i, t in enumerate(tickers)}
     
     # Remplir le triangle supérieur et inférieur (symétrie)
-    # Votre code ici
+    for asset_1, asset_2 in combinations(assets, 2):
+        i = ticker_to_idx[asset_1.ticker]
+        j = ticker_to_idx[asset_2.ticker]
+
+        try:
+            corr = asset_1.correlation_with(asset_2)
+        except ValueError:
+            # Pas assez de données / variance nulle
+            continue
+
+        # Symétrie de la matrice
+        matrix[i, j] = corr
+        matrix[j, i] = corr
     
     return pd.DataFrame(matrix, index=tickers, columns=tickers)
 
@@ -143,17 +383,12 @@ def extract_upper_triangle(corr_matrix: pd.DataFrame) -> pd.DataFrame:
     """
     # Créer un masque pour le triangle supérieur (excluant la diagonale k=1)
     mask = np.triu(np.ones(corr_matrix.shape, dtype=bool), k=1)
-    
-    for asset_1, asset_2 in combinations(assets, 2):
-        i = ticker_to_idx[asset_1.ticker]
-        j = ticker_to_idx[asset_2.ticker]
+    rows, cols = np.nonzero(mask)
+    tickers = np.asarray(corr_matrix.index)
 
-        try:
-            corr = asset_1.correlation_with(asset_2)
-        except ValueError:
-            # Pas assez de données / variance nulle
-            continue
-
-        # Symétrie de la matrice
-        matrix[i, j] = corr
-        matrix[j, i] = corr
\ No newline at end of file
+    pairs = pd.DataFrame({
+        "asset_1": tickers[rows],
+        "asset_2": tickers[cols],
+        "correlation": corr_matrix.to_numpy()[rows, cols],
+    })
+    return pairs.sort_values("correlation", ascending=False, ignore_index=True)